@@ -4,6 +4,13 @@ Alembic environment configuration for CondoEase backend.
 
 This module configures how Alembic connects to the database
 and how migrations are generated and executed.
+
+Data migrations that touch invoice/ledger rows must not load whole tables
+or run as one giant transaction; use ``migration_helpers.paginated_migrate``
+from the revision's ``upgrade()`` to process rows in committed pages.
+
+Requires SQLAlchemy >= 2.0.15 and Alembic >= 1.13 (batched reflection and
+the ``include_name`` hook used to limit autogenerate reflection).
 """
 import os
 import sys
@@ -11,13 +18,12 @@ from logging.config import fileConfig
 
 from sqlalchemy import engine_from_config, pool
 from alembic import context
-from dotenv import load_dotenv
 
 # Add parent directory to path for imports
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
-# Load environment variables
-load_dotenv()
+# Environment is loaded once by db_url
+from db_url import DATABASE_URL
 
 # Import models for autogenerate support
 from models import Base
@@ -26,20 +32,24 @@ from models import Base
 config = context.config
 
 # Setup logging from alembic.ini
-if config.config_file_name is not None:
+if config.config_file_name is not None and os.path.exists(config.config_file_name):
     fileConfig(config.config_file_name)
 
 # Target metadata for autogenerate
 target_metadata = Base.metadata
 
-# Build database URL from environment
-DB_SERVER = os.getenv("DB_SERVER")
-DB_PORT = os.getenv("DB_PORT", "1433")
-DB_USER = os.getenv("DB_USER")
-DB_PASS = os.getenv("DB_PASS")
-DB_NAME = os.getenv("DB_NAME")
 
-DATABASE_URL = f"mssql+pymssql://{DB_USER}:{DB_PASS}@{DB_SERVER}:{DB_PORT}/{DB_NAME}"
+def include_name(name, type_, parent_names) -> bool:
+    """
+    Only reflect tables that are mapped in ``models``.
+    
+    Alembic consults this before reflecting, so the legacy raw-SQL tables
+    (announcements, maintenance, unit images, ...) are never round-tripped
+    over the wire during autogenerate, and never show up as drop_table ops.
+    """
+    if type_ == "table":
+        return name in target_metadata.tables
+    return True
 
 
 def run_migrations_offline() -> None:
@@ -67,20 +77,25 @@ def run_migrations_online() -> None:
     Run migrations in 'online' mode.
     
     Creates an Engine and associates a connection with the context.
+    A single pooled connection is reused for the whole run so multi-step
+    migrations don't pay a new TLS/login handshake against Azure SQL.
     """
     configuration = config.get_section(config.config_ini_section, {})
     configuration["sqlalchemy.url"] = DATABASE_URL
+    configuration["sqlalchemy.pool_pre_ping"] = "true"
     
     connectable = engine_from_config(
         configuration,
         prefix="sqlalchemy.",
-        poolclass=pool.NullPool,
+        poolclass=pool.StaticPool,
     )
 
     with connectable.connect() as connection:
         context.configure(
             connection=connection,
             target_metadata=target_metadata,
+            include_schemas=False,
+            include_name=include_name,
             compare_type=True,
             compare_server_default=True,
         )
@@ -0,0 +1,30 @@
+"""Add covering index for vacant property unit lookups
+
+Revision ID: 20261016_000001
+Revises: 20260131_000002
+Create Date: 2026-10-16
+
+GET /api/property-units/vacant filters on status and joins on property_id.
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+revision: str = "20261016_000001"
+down_revision: Union[str, None] = "20260131_000002"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_index(
+        "ix_property_units_status_property",
+        "property_units",
+        ["status", "property_id"],
+        mssql_include=["unit_number", "unit_type", "rent_price"],
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("ix_property_units_status_property", table_name="property_units")
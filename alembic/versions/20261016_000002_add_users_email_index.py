@@ -0,0 +1,44 @@
+"""Ensure users.email is indexed
+
+Revision ID: 20261016_000002
+Revises: 20261016_000001
+Create Date: 2026-10-16
+
+Login and registration look users up by email on every call. The users
+table predates Alembic, so only create the index if it is missing. Not
+unique: nothing has enforced unique emails at the database level, and
+existing rows may already hold duplicates.
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+revision: str = "20261016_000002"
+down_revision: Union[str, None] = "20261016_000001"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.execute(
+        """
+        IF NOT EXISTS (
+            SELECT 1 FROM sys.indexes
+            WHERE name = 'ix_users_email' AND object_id = OBJECT_ID('users')
+        )
+        CREATE INDEX ix_users_email ON users (email)
+        """
+    )
+
+
+def downgrade() -> None:
+    op.execute(
+        """
+        IF EXISTS (
+            SELECT 1 FROM sys.indexes
+            WHERE name = 'ix_users_email' AND object_id = OBJECT_ID('users')
+        )
+        DROP INDEX ix_users_email ON users
+        """
+    )
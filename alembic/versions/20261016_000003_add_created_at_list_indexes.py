@@ -0,0 +1,67 @@
+"""Add created_at indexes for newest-first lease / maintenance listings
+
+Revision ID: 20261016_000003
+Revises: 20261016_000002
+Create Date: 2026-10-16
+
+GET /api/leases and GET /api/maintenance-requests page through
+(created_at DESC, id DESC). maintenance_requests is not mapped in models,
+and both tables predate Alembic, so create the indexes only if missing.
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+revision: str = "20261016_000003"
+down_revision: Union[str, None] = "20261016_000002"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.execute(
+        """
+        IF NOT EXISTS (
+            SELECT 1 FROM sys.indexes
+            WHERE name = 'ix_leases_created_at' AND object_id = OBJECT_ID('leases')
+        )
+        CREATE INDEX ix_leases_created_at
+            ON leases (created_at DESC, id DESC)
+            INCLUDE (property_id, property_unit_id, tenant_id)
+        """
+    )
+    op.execute(
+        """
+        IF NOT EXISTS (
+            SELECT 1 FROM sys.indexes
+            WHERE name = 'ix_maintenance_requests_created_at'
+              AND object_id = OBJECT_ID('maintenance_requests')
+        )
+        CREATE INDEX ix_maintenance_requests_created_at
+            ON maintenance_requests (created_at DESC, id DESC)
+            INCLUDE (tenant_id, status)
+        """
+    )
+
+
+def downgrade() -> None:
+    op.execute(
+        """
+        IF EXISTS (
+            SELECT 1 FROM sys.indexes
+            WHERE name = 'ix_maintenance_requests_created_at'
+              AND object_id = OBJECT_ID('maintenance_requests')
+        )
+        DROP INDEX ix_maintenance_requests_created_at ON maintenance_requests
+        """
+    )
+    op.execute(
+        """
+        IF EXISTS (
+            SELECT 1 FROM sys.indexes
+            WHERE name = 'ix_leases_created_at' AND object_id = OBJECT_ID('leases')
+        )
+        DROP INDEX ix_leases_created_at ON leases
+        """
+    )
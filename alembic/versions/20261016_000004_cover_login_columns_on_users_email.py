@@ -0,0 +1,58 @@
+"""Cover the login lookup with ix_users_email
+
+Revision ID: 20261016_000004
+Revises: 20261016_000003
+Create Date: 2026-10-16
+
+POST /api/login reads only these columns by email; including them in the
+index turns the lookup into a single seek with no key lookup.
+
+20261016_000002 leaves an existing ix_users_email alone, so the index found
+here may be its non-unique one or an older unique one (models.User declares
+email unique + indexed). Rebuild it with whatever uniqueness it already has,
+and create it non-unique if it is missing altogether.
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+revision: str = "20261016_000004"
+down_revision: Union[str, None] = "20261016_000003"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+COVERED_COLUMNS = "password, first_name, last_name, role, email_verified, is_active"
+
+
+def _rebuild_email_index(include: str, create_if_missing: bool) -> str:
+    """T-SQL that rebuilds ix_users_email with ``include``, keeping its uniqueness."""
+    sql = f"""
+        IF EXISTS (
+            SELECT 1 FROM sys.indexes
+            WHERE name = 'ix_users_email' AND object_id = OBJECT_ID('users') AND is_unique = 1
+        )
+            CREATE UNIQUE INDEX ix_users_email ON users (email) {include}
+                WITH (DROP_EXISTING = ON)
+        ELSE IF EXISTS (
+            SELECT 1 FROM sys.indexes
+            WHERE name = 'ix_users_email' AND object_id = OBJECT_ID('users')
+        )
+            CREATE INDEX ix_users_email ON users (email) {include}
+                WITH (DROP_EXISTING = ON)
+        """
+    if create_if_missing:
+        sql += f"""ELSE
+            CREATE INDEX ix_users_email ON users (email) {include}
+        """
+    return sql
+
+
+def upgrade() -> None:
+    op.execute(_rebuild_email_index(f"INCLUDE ({COVERED_COLUMNS})", create_if_missing=True))
+
+
+def downgrade() -> None:
+    # Back to the key-only index; 20261016_000002's downgrade drops it from there
+    op.execute(_rebuild_email_index("", create_if_missing=False))
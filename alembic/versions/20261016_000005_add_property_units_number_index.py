@@ -0,0 +1,32 @@
+"""Index property units by (property_id, unit_number)
+
+Revision ID: 20261016_000005
+Revises: 20261016_000004
+Create Date: 2026-10-16
+
+The unit create/update routes check for a duplicate unit number inside the
+write (NOT EXISTS ... WITH (UPDLOCK, HOLDLOCK)); this index turns that check
+into a seek and keeps its range lock to one property's unit number instead
+of the whole table. Not unique: existing rows may already hold duplicates.
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+revision: str = "20261016_000005"
+down_revision: Union[str, None] = "20261016_000004"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_index(
+        "ix_property_units_property_unit_number",
+        "property_units",
+        ["property_id", "unit_number"],
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("ix_property_units_property_unit_number", table_name="property_units")
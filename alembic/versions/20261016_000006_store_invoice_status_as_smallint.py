@@ -0,0 +1,89 @@
+"""Store invoices.status as a SMALLINT code
+
+Revision ID: 20261016_000006
+Revises: 20261016_000005
+Create Date: 2026-10-16
+
+The status column and ix_invoices_status shrink from VARCHAR(7) to a 2-byte
+code (0=PENDING, 1=PAID, 2=OVERDUE); models.invoice.InvoiceStatusType maps
+it back to InvoiceStatus. Existing rows are converted through a staging
+column filled in committed pages.
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+from migration_helpers import paginated_migrate
+
+
+revision: str = "20261016_000006"
+down_revision: Union[str, None] = "20261016_000005"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+invoices = sa.table("invoices", sa.column("id"), sa.column("status"))
+
+
+def _to_code(connection, rows):
+    connection.execute(
+        sa.text(
+            """
+            UPDATE invoices SET status_code = CASE status
+                WHEN 'PENDING' THEN 0 WHEN 'PAID' THEN 1 WHEN 'OVERDUE' THEN 2
+            END
+            WHERE id BETWEEN :first AND :last
+            """
+        ),
+        {"first": rows[0].id, "last": rows[-1].id},
+    )
+
+
+def _to_name(connection, rows):
+    connection.execute(
+        sa.text(
+            """
+            UPDATE invoices SET status_name = CASE status
+                WHEN 0 THEN 'PENDING' WHEN 1 THEN 'PAID' WHEN 2 THEN 'OVERDUE'
+            END
+            WHERE id BETWEEN :first AND :last
+            """
+        ),
+        {"first": rows[0].id, "last": rows[-1].id},
+    )
+
+
+def upgrade() -> None:
+    op.drop_index("ix_invoices_status", table_name="invoices")
+    op.add_column("invoices", sa.Column("status_code", sa.SmallInteger(), nullable=True))
+    paginated_migrate(invoices, _to_code)
+
+    # Unknown names were left NULL, so the NOT NULL below fails loudly on them
+    op.drop_column("invoices", "status", mssql_drop_default=True, mssql_drop_check=True)
+    op.alter_column("invoices", "status_code", new_column_name="status", existing_type=sa.SmallInteger())
+    op.alter_column(
+        "invoices", "status",
+        existing_type=sa.SmallInteger(),
+        nullable=False,
+        server_default="0",
+    )
+    op.create_check_constraint("ck_invoices_status", "invoices", "status IN (0, 1, 2)")
+    op.create_index("ix_invoices_status", "invoices", ["status"])
+
+
+def downgrade() -> None:
+    op.drop_index("ix_invoices_status", table_name="invoices")
+    op.drop_constraint("ck_invoices_status", "invoices", type_="check")
+    op.add_column("invoices", sa.Column("status_name", sa.String(7), nullable=True))
+    paginated_migrate(invoices, _to_name)
+
+    op.drop_column("invoices", "status", mssql_drop_default=True)
+    op.alter_column("invoices", "status_name", new_column_name="status", existing_type=sa.String(7))
+    op.alter_column(
+        "invoices", "status",
+        existing_type=sa.String(7),
+        nullable=False,
+        server_default="PENDING",
+    )
+    op.create_index("ix_invoices_status", "invoices", ["status"])
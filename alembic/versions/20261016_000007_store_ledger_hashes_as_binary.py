@@ -0,0 +1,102 @@
+"""Store payment_ledger hashes as BINARY(32)
+
+Revision ID: 20261016_000007
+Revises: 20261016_000006
+Create Date: 2026-10-16
+
+transaction_hash / previous_hash go from 64-char hex strings to the raw
+SHA-256 digest, halving the key width of the unique constraint and the
+hash indexes. The genesis marker "0" becomes 32 zero bytes
+(services.ledger_service.GENESIS_HASH). Existing rows are converted through
+staging columns filled in committed pages.
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+from migration_helpers import paginated_migrate
+
+
+revision: str = "20261016_000007"
+down_revision: Union[str, None] = "20261016_000006"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+payment_ledger = sa.table("payment_ledger", sa.column("id"))
+
+GENESIS_BINARY = "CONVERT(BINARY(32), REPLICATE('00', 32), 2)"
+
+
+def _to_binary(connection, rows):
+    connection.execute(
+        sa.text(
+            f"""
+            UPDATE payment_ledger SET
+                transaction_hash_bin = CONVERT(BINARY(32), transaction_hash, 2),
+                previous_hash_bin = CASE previous_hash
+                    WHEN '0' THEN {GENESIS_BINARY}
+                    ELSE CONVERT(BINARY(32), previous_hash, 2)
+                END
+            WHERE id BETWEEN :first AND :last
+            """
+        ),
+        {"first": rows[0].id, "last": rows[-1].id},
+    )
+
+
+def _to_hex(connection, rows):
+    # Style 2 renders without the 0x prefix, in upper case; hexdigest() is lower
+    connection.execute(
+        sa.text(
+            f"""
+            UPDATE payment_ledger SET
+                transaction_hash_hex = LOWER(CONVERT(VARCHAR(64), transaction_hash, 2)),
+                previous_hash_hex = CASE previous_hash
+                    WHEN {GENESIS_BINARY} THEN '0'
+                    ELSE LOWER(CONVERT(VARCHAR(64), previous_hash, 2))
+                END
+            WHERE id BETWEEN :first AND :last
+            """
+        ),
+        {"first": rows[0].id, "last": rows[-1].id},
+    )
+
+
+def _swap_hash_columns(suffix: str, type_) -> None:
+    """Replace both hash columns with their converted staging columns."""
+    for name in ("transaction_hash", "previous_hash"):
+        op.drop_column("payment_ledger", name)
+        op.alter_column("payment_ledger", f"{name}_{suffix}", new_column_name=name, existing_type=type_)
+        op.alter_column("payment_ledger", name, existing_type=type_, nullable=False)
+
+
+def _drop_hash_keys() -> None:
+    op.drop_index("ix_payment_ledger_previous_hash", table_name="payment_ledger")
+    op.drop_index("ix_payment_ledger_transaction_hash", table_name="payment_ledger")
+    op.drop_constraint("uq_payment_ledger_transaction_hash", "payment_ledger", type_="unique")
+
+
+def _create_hash_keys() -> None:
+    op.create_unique_constraint("uq_payment_ledger_transaction_hash", "payment_ledger", ["transaction_hash"])
+    op.create_index("ix_payment_ledger_transaction_hash", "payment_ledger", ["transaction_hash"])
+    op.create_index("ix_payment_ledger_previous_hash", "payment_ledger", ["previous_hash"])
+
+
+def upgrade() -> None:
+    _drop_hash_keys()
+    op.add_column("payment_ledger", sa.Column("transaction_hash_bin", sa.BINARY(32), nullable=True))
+    op.add_column("payment_ledger", sa.Column("previous_hash_bin", sa.BINARY(32), nullable=True))
+    paginated_migrate(payment_ledger, _to_binary)
+    _swap_hash_columns("bin", sa.BINARY(32))
+    _create_hash_keys()
+
+
+def downgrade() -> None:
+    _drop_hash_keys()
+    op.add_column("payment_ledger", sa.Column("transaction_hash_hex", sa.String(64), nullable=True))
+    op.add_column("payment_ledger", sa.Column("previous_hash_hex", sa.String(64), nullable=True))
+    paginated_migrate(payment_ledger, _to_hex)
+    _swap_hash_columns("hex", sa.String(64))
+    _create_hash_keys()
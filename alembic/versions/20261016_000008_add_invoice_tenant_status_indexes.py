@@ -0,0 +1,49 @@
+"""Replace single-column invoice indexes with covering composites
+
+Revision ID: 20261016_000008
+Revises: 20261016_000007
+Create Date: 2026-10-16
+
+Invoice lists filter by tenant (+ status) and order by due_date DESC;
+INCLUDE (amount) lets those pages be served from the index alone.
+ix_invoices_tenant_id is a left prefix of the composite, and
+ix_invoices_status (three distinct values) is too unselective to be picked;
+both only add write cost.
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+revision: str = "20261016_000008"
+down_revision: Union[str, None] = "20261016_000007"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_index(
+        "ix_invoices_tenant_status_duedate",
+        "invoices",
+        ["tenant_id", "status", sa.text("due_date DESC")],
+        mssql_include=["amount"],
+    )
+    # Filtered index for open balances / overdue lookups per tenant
+    # (status is the SMALLINT code from 20261016_000006; 0 = PENDING)
+    op.create_index(
+        "ix_invoices_pending",
+        "invoices",
+        ["tenant_id", "due_date"],
+        mssql_where=sa.text("status = 0"),
+        mssql_include=["amount"],
+    )
+    op.drop_index("ix_invoices_status", table_name="invoices")
+    op.drop_index("ix_invoices_tenant_id", table_name="invoices")
+
+
+def downgrade() -> None:
+    op.create_index("ix_invoices_tenant_id", "invoices", ["tenant_id"])
+    op.create_index("ix_invoices_status", "invoices", ["status"])
+    op.drop_index("ix_invoices_pending", table_name="invoices")
+    op.drop_index("ix_invoices_tenant_status_duedate", table_name="invoices")
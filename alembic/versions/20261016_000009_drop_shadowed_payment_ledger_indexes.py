@@ -0,0 +1,29 @@
+"""Drop payment_ledger indexes shadowed by unique constraints
+
+Revision ID: 20261016_000009
+Revises: 20261016_000008
+Create Date: 2026-10-16
+
+uq_payment_ledger_invoice_id and uq_payment_ledger_transaction_hash already
+index those columns; the separate non-unique indexes on the same keys are
+never chosen over them and only add write cost per INSERT.
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+revision: str = "20261016_000009"
+down_revision: Union[str, None] = "20261016_000008"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.drop_index("ix_payment_ledger_transaction_hash", table_name="payment_ledger")
+    op.drop_index("ix_payment_ledger_invoice_id", table_name="payment_ledger")
+
+
+def downgrade() -> None:
+    op.create_index("ix_payment_ledger_invoice_id", "payment_ledger", ["invoice_id"])
+    op.create_index("ix_payment_ledger_transaction_hash", "payment_ledger", ["transaction_hash"])
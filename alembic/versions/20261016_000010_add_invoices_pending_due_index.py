@@ -0,0 +1,33 @@
+"""Add filtered due_date index for pending invoices
+
+Revision ID: 20261016_000010
+Revises: 20261016_000009
+Create Date: 2026-10-16
+
+The nightly overdue sweep looks for PENDING invoices with due_date < today
+across all tenants; ix_invoices_pending leads with tenant_id and cannot
+serve that range scan.
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+revision: str = "20261016_000010"
+down_revision: Union[str, None] = "20261016_000009"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_index(
+        "ix_invoices_pending_due",
+        "invoices",
+        ["due_date"],
+        mssql_where=sa.text("status = 0"),
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("ix_invoices_pending_due", table_name="invoices")
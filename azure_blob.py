@@ -1,37 +1,67 @@
-from azure.storage.blob import BlobServiceClient
+from azure.storage.blob.aio import BlobServiceClient
+import functools
 import os
-import uuid
+import secrets
+from pathlib import PurePosixPath
+from urllib.parse import urlparse
 
 account = os.getenv("AZURE_STORAGE_ACCOUNT")
 key = os.getenv("AZURE_STORAGE_KEY")
-blob_service = BlobServiceClient.from_connection_string(
-     f"DefaultEndpointsProtocol=https;"
-     f"AccountName={account};"
-     f"AccountKey={key};"
-     f"EndpointSuffix=core.windows.net"
-)
+
+# Upload tuning (per deployment). Files larger than one block are split
+# into blocks and PUT in parallel; smaller files go up in a single request.
+MAX_CONCURRENCY = int(os.getenv("AZURE_BLOB_MAX_CONCURRENCY", "8"))
+MAX_BLOCK_SIZE = int(os.getenv("AZURE_BLOB_MAX_BLOCK_SIZE", str(8 * 1024 * 1024)))
+
+# Async client; created on first upload/delete (never at import, so Alembic
+# and other importers skip it) and closed from the app lifespan on shutdown.
+@functools.cache
+def _client() -> BlobServiceClient:
+     return BlobServiceClient.from_connection_string(
+          f"DefaultEndpointsProtocol=https;"
+          f"AccountName={account};"
+          f"AccountKey={key};"
+          f"EndpointSuffix=core.windows.net",
+          max_block_size=MAX_BLOCK_SIZE,
+          max_single_put_size=MAX_BLOCK_SIZE,
+     )
+
+async def close_blob_service():
+     if _client.cache_info().currsize:
+          client = _client()
+          _container_client.cache_clear()
+          _client.cache_clear()
+          await client.close()
+
+@functools.lru_cache(maxsize=16)
+def _container_client(container: str):
+     return _client().get_container_client(container)
 
 # def upload_to_blob(file, container):
-def upload_to_blob(file, container: str, user_id: str | int):
-     ext = os.path.splitext(file.filename)[1]
+async def upload_to_blob(file, container: str, user_id: str | int):
+     ext = PurePosixPath(file.filename).suffix
      # filename = f"{uuid.uuid4()}{ext}"
-     filename = f"{user_id}/{uuid.uuid4()}{ext}"
+     filename = f"{user_id}/{secrets.token_hex(16)}{ext}"
      # blob_client = blob_service.get_blob_client(container, filename)
      # content = file.file.read()
      # blob_client.upload_blob(content, overwrite=True)
-     blob_client = blob_service.get_blob_client(container=container, blob=filename)
-     blob_client.upload_blob(file.file, overwrite=True)
+     blob_client = _client().get_blob_client(container=container, blob=filename)
+     size = getattr(file, "size", None)
+     concurrency = 1 if size is not None and size <= MAX_BLOCK_SIZE else MAX_CONCURRENCY
+     await blob_client.upload_blob(
+          file.file,
+          overwrite=True,
+          length=size,
+          max_concurrency=concurrency,
+     )
      return f"https://{account}.blob.core.windows.net/{container}/{filename}"
 
-def delete_from_blob(blob_url: str):
+async def delete_from_blob(blob_url: str):
      """
      Deletes a file from Azure Blob Storage using its full URL
      """
-     parts = blob_url.split("/")
-     container = parts[-2]
-     blob_name = parts[-1]
-     blob_client = blob_service.get_blob_client(
-          container=container,
-          blob=blob_name
-     )
-     blob_client.delete_blob()
+     # Blob names can contain "/" (e.g. "<user_id>/<uuid>.ext"), so split
+     # the container off the front instead of taking the last two segments.
+     path = urlparse(blob_url).path.lstrip("/")
+     container, _, blob_name = path.partition("/")
+     await _container_client(container).delete_blob(blob_name)
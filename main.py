@@ -1,60 +1,300 @@
+import asyncio
+import hashlib
+import io
 import random
+import secrets
 import shutil
+import threading
 import time
 import os       
-from typing import List, Optional
+from typing import Any, List, Literal, Optional
 import uuid
-from fastapi import FastAPI, APIRouter, Form, Request, Depends, HTTPException, status, File, UploadFile, WebSocket, WebSocketDisconnect
-from fastapi.responses import JSONResponse
+from contextlib import asynccontextmanager
+from fastapi import FastAPI, APIRouter, BackgroundTasks, Form, Query, Request, Depends, HTTPException, status, File, UploadFile, WebSocket, WebSocketDisconnect
+from fastapi.responses import JSONResponse, ORJSONResponse, Response
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.staticfiles import StaticFiles
+from starlette.exceptions import HTTPException as StarletteHTTPException
 from pydantic import BaseModel
-from jose import JWTError, jwt
-from passlib.context import CryptContext
-import pymssql
+import jwt
+from jwt import InvalidTokenError
+from cachetools import TLRUCache, TTLCache
 from dotenv import load_dotenv
+import orjson
 import uvicorn
+import anyio
+import anyio.from_thread
+import anyio.to_thread
 from uuid import uuid4
 from datetime import datetime, timedelta
 from decimal import Decimal
-from azure_blob import upload_to_blob
-from utils.email import send_otp_email
+from azure_blob import upload_to_blob, close_blob_service
+from database import MAX_OVERFLOW, POOL_SIZE, engine, warm_pool
+from sqlalchemy.exc import TimeoutError as PoolTimeoutError
+from utils.email import send_otp_email_background
+from utils.passwords import (
+    hash_password,
+    hash_password_async,
+    shutdown_hash_executor,
+    start_hash_executor,
+    verify_password_async,
+)
 
-# Load .env
-load_dotenv()
-SECRET_KEY = os.getenv("JWT_SECRET")
+# Load .env (production containers inject env vars directly)
+if not os.getenv("CONDOEASE_ENV", "").startswith("prod"):
+    load_dotenv()
+# Encoded once so PyJWT doesn't re-encode the HMAC key on every call
+SECRET_KEY = os.getenv("JWT_SECRET", "").encode() or None
 ALGORITHM = "HS256"
 
-# Bcrypt
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
 
-# Azure SQL config for pymssql
-def get_db():
+# Azure SQL (pymssql) connections, checked out of the shared SQLAlchemy pool
+def checkout_connection():
+    """
+    Check a raw pymssql connection out of the pool.
+    
+    Every route-path checkout goes through here so pool exhaustion is
+    reported the same way everywhere: 503, not a 500.
+    """
     try:
-        conn = pymssql.connect(
-            server=os.getenv("DB_SERVER"),
-            port=int(os.getenv("DB_PORT")),
-            user=os.getenv("DB_USER"),
-            password=os.getenv("DB_PASS"),
-            database=os.getenv("DB_NAME"),
-        )
-        return conn
+        return engine.raw_connection()
+    except PoolTimeoutError:
+        # Pool exhausted for pool_timeout seconds: shed load instead of 500
+        raise HTTPException(status_code=503, detail="Server busy, please retry")
     except Exception as e:
         print("Database connection failed:", e)
         raise
 
-def clean_row(row):
-    safe = {}
-    for k, v in row.items():
-        if isinstance(v, datetime):
-            safe[k] = v.isoformat()
-        elif isinstance(v, Decimal):
-            safe[k] = float(v)
+def get_db():
+    """
+    FastAPI dependency yielding a pooled raw pymssql connection.
+    
+    close() hands the connection back to the pool (rolling back anything
+    left uncommitted) instead of tearing down the TCP/TLS session.
+    """
+    conn = checkout_connection()
+    try:
+        yield conn
+    finally:
+        conn.close()
+
+def execute_prepared(cursor, sql: str, param_decl: str, params: tuple):
+    """
+    Run a parameterized statement through sp_executesql.
+    
+    pymssql inlines %s parameters as literals, so every distinct value is a
+    new ad-hoc batch for SQL Server to compile; sp_executesql keeps the
+    statement text constant and lets the plan cache hit.
+    
+    sql uses @p1, @p2, ... placeholders declared in param_decl.
+    """
+    if not params:
+        # Constant text already reuses its plan; no need for the wrapper
+        cursor.execute(sql)
+        return
+    placeholders = ", ".join(["%s"] * len(params))
+    cursor.execute(f"EXEC sp_executesql %s, %s, {placeholders}", (sql, param_decl, *params))
+
+# Read-mostly dashboard lists (tenants, owners, properties, units, leases)
+# and detail views (tenant/owner by id, vacant units), keyed by (list name,
+# paging params or id). Any write route that touches those
+# tables clears the whole cache once it has run, via
+# Depends(invalidates_lists). The cache is per process: a write only clears
+# the worker that served it, so other uvicorn workers may serve the old rows
+# until the 30s TTL expires.
+_list_cache = TTLCache(maxsize=2048, ttl=30)
+_list_cache_lock = threading.Lock()
+
+def cached_list(key: tuple, sql: str, param_decl: str, params: tuple, columnar: bool = False):
+    """
+    Return rows for key from the list cache, querying on a miss.
+    
+    A pooled connection is only checked out on a miss, so cache hits cost
+    no DB round-trip (not even the pool's pre-ping). With columnar=True the
+    result is {"columns": [...], "rows": [tuple, ...]} (see columnar_response).
+    """
+    key = (*key, columnar)
+    with _list_cache_lock:
+        rows = _list_cache.get(key)
+    if rows is not None:
+        return rows
+    conn = checkout_connection()
+    try:
+        cursor = conn.cursor(as_dict=not columnar)
+        execute_prepared(cursor, sql, param_decl, params)
+        rows = cursor.fetchall()
+        if columnar:
+            rows = {"columns": [c[0] for c in cursor.description], "rows": rows}
+    finally:
+        conn.close()
+    with _list_cache_lock:
+        _list_cache[key] = rows
+    return rows
+
+# ?layout=columns on the wide list endpoints: plain tuple rows plus one
+# column header instead of a dict per row. Opt-in so existing clients keep
+# the list-of-objects shape.
+ListLayout = Literal["rows", "columns"]
+LAYOUT_QUERY = Query("rows", description="'columns' returns {columns, rows} with array rows")
+
+def _json_default(obj):
+    if isinstance(obj, Decimal):
+        return float(obj)
+    raise TypeError
+
+def columnar_response(data: dict) -> Response:
+    """Serialize a {columns, rows} payload with orjson, skipping jsonable_encoder."""
+    return Response(orjson.dumps(data, default=_json_default), media_type="application/json")
+
+# Newest-first keyset paging over (created_at DESC, id DESC). The cursor is
+# the last row's (created_at, id); both halves are needed, since rows that
+# share the boundary created_at are told apart by id.
+def keyset_filter(alias: str, before: Optional[datetime], before_id: Optional[int], limit: int):
+    """Return (params, param_decl, where) for a page of up to limit rows."""
+    if (before is None) != (before_id is None):
+        raise HTTPException(status_code=422, detail="before and before_id must be sent together")
+    if before is None:
+        return (limit,), "@p1 int", ""
+    return (
+        (limit, before, before_id),
+        "@p1 int, @p2 datetime2, @p3 int",
+        f"WHERE {alias}.created_at < @p2 OR ({alias}.created_at = @p2 AND {alias}.id < @p3)",
+    )
+
+def next_cursor(rows, limit: int, id_column: str, columns: Optional[list] = None) -> dict:
+    """
+    {next_before, next_before_id} for the page after rows; both None once a
+    short page shows there is nothing left. Pass columns for tuple rows.
+    """
+    if len(rows) < limit:
+        return {"next_before": None, "next_before_id": None}
+    last = dict(zip(columns, rows[-1])) if columns is not None else rows[-1]
+    return {"next_before": last["created_at"], "next_before_id": last[id_column]}
+
+def invalidate_list_cache():
+    with _list_cache_lock:
+        _list_cache.clear()
+
+def invalidates_lists():
+    """Route dependency: clear the list cache after the handler has committed."""
+    try:
+        yield
+    finally:
+        invalidate_list_cache()
+
+MAINTENANCE_ATTACHMENT_COLUMNS = ("attachment_id", "file_url", "file_type", "uploaded_at")
+
+def fold_attachments(rows: list) -> dict:
+    """
+    Fold a maintenance_requests LEFT JOIN maintenance_attachments result
+    back into one request dict with an "attachments" list.
+    
+    The join yields one row per attachment (or a single row with NULLs if
+    there are none), so the request and its attachments come back in one
+    round trip.
+    """
+    cols = MAINTENANCE_ATTACHMENT_COLUMNS
+    result = {k: v for k, v in rows[0].items() if k not in cols}
+    result["attachments"] = [
+        {k: row[k] for k in cols}
+        for row in rows
+        if row["attachment_id"] is not None
+    ]
+    return result
+
+AVATAR_EXTENSIONS = frozenset({".png", ".jpg", ".jpeg", ".webp"})
+
+# Upload size caps (bytes)
+MAX_AVATAR_BYTES = int(os.getenv("MAX_AVATAR_BYTES", 5 * 1024 * 1024))
+MAX_UPLOAD_BYTES = int(os.getenv("MAX_UPLOAD_BYTES", 25 * 1024 * 1024))
+
+class MaxBodySizeMiddleware:
+    """
+    Reject requests whose Content-Length exceeds MAX_UPLOAD_BYTES.
+    
+    FastAPI parses multipart forms before any dependency or handler runs,
+    so the cap has to sit in front of the app to refuse oversized uploads
+    before they are spooled to disk. Plain ASGI (not BaseHTTPMiddleware):
+    one header lookup per request.
+    """
+    def __init__(self, app, max_bytes: int):
+        self.app = app
+        self.max_bytes = max_bytes
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] == "http":
+            for name, value in scope["headers"]:
+                if name == b"content-length":
+                    if value.isdigit() and int(value) > self.max_bytes:
+                        response = JSONResponse(status_code=413, content={"detail": "Upload too large"})
+                        await response(scope, receive, send)
+                        return
+                    break
+        await self.app(scope, receive, send)
+
+def check_upload_size(upload: UploadFile, limit: int):
+    """Per-file cap; also covers chunked requests with no Content-Length."""
+    if upload.size is not None and upload.size > limit:
+        raise HTTPException(status_code=413, detail=f"{upload.filename} is too large")
+
+# 1 MiB: fewer read/write syscalls than shutil's 64 KiB default
+UPLOAD_CHUNK_SIZE = 1 << 20
+
+def _upload_fd(src):
+    """
+    File descriptor backing an upload, or None if it only lives in memory.
+    
+    SpooledTemporaryFile.fileno() would roll an in-memory spool over to
+    disk just to hand out a descriptor, so check what it wraps first (there
+    is no public "rolled over" flag). Anything else without a real
+    descriptor raises from fileno() and gets the copy loop too.
+    """
+    if isinstance(getattr(src, "_file", None), io.BytesIO):
+        return None
+    try:
+        return src.fileno()
+    except (AttributeError, OSError, io.UnsupportedOperation):
+        return None
+
+def copy_upload(src, path: str):
+    """
+    Copy an UploadFile's spooled file to path.
+    
+    Once Starlette's SpooledTemporaryFile has rolled over to a real temp
+    file, os.sendfile copies it in-kernel with no userspace buffers;
+    in-memory spools (small uploads) fall back to a 1 MiB copy loop.
+    """
+    src_fd = _upload_fd(src) if hasattr(os, "sendfile") else None
+    with open(path, "wb") as dst:
+        if src_fd is not None:
+            dst_fd = dst.fileno()
+            offset = src.tell()
+            size = os.fstat(src_fd).st_size
+            while offset < size:
+                sent = os.sendfile(dst_fd, src_fd, offset, size - offset)
+                if sent == 0:
+                    break
+                offset += sent
         else:
-            safe[k] = v
-    return safe
+            shutil.copyfileobj(src, dst, UPLOAD_CHUNK_SIZE)
+
+async def save_upload(upload: UploadFile, path: str):
+    """Write an upload to disk from the threadpool, off the event loop."""
+    await anyio.to_thread.run_sync(copy_upload, upload.file, path)
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # Sync routes block on pymssql inside Starlette's threadpool; size it to
+    # the DB pool (pool_size + max_overflow) instead of anyio's default 40 so
+    # the pool, not the thread limiter, is what bounds concurrency.
+    anyio.to_thread.current_default_thread_limiter().total_tokens = POOL_SIZE + MAX_OVERFLOW
+    start_hash_executor()
+    await anyio.to_thread.run_sync(warm_pool)
+    yield
+    shutdown_hash_executor()
+    await close_blob_service()
+
 # App instance
-app = FastAPI()
+app = FastAPI(lifespan=lifespan, default_response_class=ORJSONResponse)
 
 # Health runtime check  
 @app.get("/")
@@ -63,6 +303,7 @@ def health_check():
 
 # CORS
 origins = os.getenv("CORS_ORIGINS", "").split(",")
+app.add_middleware(MaxBodySizeMiddleware, max_bytes=MAX_UPLOAD_BYTES)
 app.add_middleware(
     CORSMiddleware,
     allow_origins=origins,
@@ -72,9 +313,29 @@ app.add_middleware(
 )
 
 # Mount static uploads
+class ImmutableStaticFiles(StaticFiles):
+    """
+    StaticFiles with long-lived caching.
+    
+    Uploads are written under fresh (uuid/timestamp) names and never
+    overwritten, so browsers and any CDN in front can keep them forever.
+    """
+    async def get_response(self, path: str, scope):
+        response = await super().get_response(path, scope)
+        if response.status_code in (200, 304):
+            response.headers["Cache-Control"] = "public, max-age=31536000, immutable"
+        return response
+
+# Upload directories; created once here, never per request
 UPLOAD_DIR = os.path.join(os.path.dirname(__file__), "uploads")
-os.makedirs(UPLOAD_DIR, exist_ok=True)
-app.mount("/uploads", StaticFiles(directory=UPLOAD_DIR), name="uploads")
+TENANT_ID_DIR = os.path.join(UPLOAD_DIR, "id", "tenants")
+OWNER_ID_DIR = os.path.join(UPLOAD_DIR, "id", "property-owners")
+PROPERTY_IMAGE_DIR = os.path.join(UPLOAD_DIR, "properties")
+UNIT_IMAGE_DIR = os.path.join(UPLOAD_DIR, "unit-images")
+LEASE_DIR = os.path.join(UPLOAD_DIR, "leases")
+for _dir in (UPLOAD_DIR, TENANT_ID_DIR, OWNER_ID_DIR, PROPERTY_IMAGE_DIR, UNIT_IMAGE_DIR, LEASE_DIR):
+    os.makedirs(_dir, exist_ok=True)
+app.mount("/uploads", ImmutableStaticFiles(directory=UPLOAD_DIR), name="uploads")
 
 # Auth Schemas
 class LoginRequest(BaseModel):
@@ -109,33 +370,28 @@ class OwnerStatusUpdate(BaseModel):
     
 class ConnectionManager:
     def __init__(self):
-        self.active_connections: list[WebSocket] = []
+        # A set for O(1) disconnects. Mutations never await, so on the single
+        # event loop they can't interleave with broadcast()'s snapshot; no lock.
+        self.active_connections: set[WebSocket] = set()
     async def connect(self, websocket: WebSocket):
         await websocket.accept()
-        self.active_connections.append(websocket)
+        self.active_connections.add(websocket)
 
     def disconnect(self, websocket: WebSocket):
-        self.active_connections.remove(websocket)
-    def _clean(self, data):
-        if isinstance(data, dict):
-            return {k: self._clean(v) for k, v in data.items()}
-        elif isinstance(data, list):
-            return [self._clean(v) for v in data]
-        elif isinstance(data, datetime):
-            return data.isoformat()
-        elif isinstance(data, Decimal):
-            return float(data)
-        else:
-            return data
+        self.active_connections.discard(websocket)
 
-    async def broadcast(self, message: dict):
-        safe_message = self._clean(message)
+    async def _send(self, connection: WebSocket, payload: str):
+        try:
+            await connection.send_text(payload)
+        except Exception:
+            self.disconnect(connection)
 
-        for connection in self.active_connections:
-            try:
-                await connection.send_json(safe_message)
-            except Exception:
-                self.disconnect(connection)
+    async def broadcast(self, message: dict):
+        # Serialize once for every client, then fan the sends out
+        # concurrently; iterate a snapshot since failed sends disconnect.
+        # Text frames, so clients keep receiving JSON strings as before.
+        payload = orjson.dumps(message, default=_json_default).decode()
+        await asyncio.gather(*(self._send(c, payload) for c in tuple(self.active_connections)))
 ws_manager = ConnectionManager()
 @app.websocket("/ws/announcements")
 async def announcement_ws(websocket: WebSocket):
@@ -146,28 +402,88 @@ async def announcement_ws(websocket: WebSocket):
     except WebSocketDisconnect:
         ws_manager.disconnect(websocket)
 
+# Validated JWT payloads keyed by a blake2b digest of the token (raw tokens
+# are never stored). Each entry lives min(30s, until "exp"), so a cached
+# token never outlives its expiry; failures are never cached.
+JWT_CACHE_TTL = 30
+
+def _jwt_ttu(key, payload, now):
+    return min(now + JWT_CACHE_TTL, payload["exp"])
+
+_jwt_cache = TLRUCache(maxsize=20_000, ttu=_jwt_ttu, timer=time.time)
+_jwt_cache_lock = threading.Lock()
+
 # Token Auth Dependency
 def verify_token(request: Request):
+    # Decoded once per request; later callers (nested dependencies, routers
+    # reading request.state.user) reuse it
+    payload = getattr(request.state, "user", None)
+    if payload is not None:
+        return payload
     auth = request.headers.get("Authorization")
-    if not auth or not auth.startswith("Bearer "):
+    if not auth or auth[:7] != "Bearer ":
         raise HTTPException(status_code=401, detail="Missing token")
-    token = auth.split(" ")[1]
-    try:
-        payload = jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
-        return payload
-    except JWTError:
-        raise HTTPException(status_code=403, detail="Invalid token")
+    token = auth[7:]
+    key = hashlib.blake2b(token.encode(), digest_size=16).digest()
+    with _jwt_cache_lock:
+        payload = _jwt_cache.get(key)
+    if payload is None:
+        try:
+            payload = jwt.decode(
+                token,
+                SECRET_KEY,
+                algorithms=[ALGORITHM],
+                options={"require": ["exp", "id", "role"]},
+            )
+        except InvalidTokenError:
+            raise HTTPException(status_code=403, detail="Invalid token")
+        with _jwt_cache_lock:
+            _jwt_cache[key] = payload
+    request.state.user = payload
+    return payload
 
-@app.post("/api/login")
-def login_user(body: LoginRequest):
-    db = get_db()
+# Blocking pymssql helpers for the password routes below. Those routes are
+# async so the hash work can be awaited on the process pool; the DB calls
+# are pushed to the threadpool with anyio.to_thread.run_sync.
+def _fetch_login_user(db, email: str):
     cursor = db.cursor(as_dict=True)
-    cursor.execute("SELECT * FROM users WHERE email = %s", (body.email,))
-    user = cursor.fetchone()
+    execute_prepared(
+        cursor,
+        """
+        SELECT id, email, password, first_name, last_name, role, email_verified, is_active
+        FROM users WHERE email = @p1
+        """,
+        "@p1 nvarchar(255)",
+        (email,),
+    )
+    return cursor.fetchone()
+
+def _fetch_password_hash(db, user_id: int):
+    cursor = db.cursor()
+    cursor.execute("SELECT password FROM users WHERE id = %s", (user_id,))
+    row = cursor.fetchone()
+    return row[0] if row else None
+
+def _execute_and_commit(db, sql: str, params: tuple) -> int:
+    cursor = db.cursor()
+    cursor.execute(sql, params)
+    rowcount = cursor.rowcount
+    db.commit()
+    return rowcount
+
+@app.post("/api/login")
+async def login_user(body: LoginRequest, db: Any = Depends(get_db)):
+    user = await anyio.to_thread.run_sync(_fetch_login_user, db, body.email)
     if not user:
         raise HTTPException(status_code=401, detail="Invalid credentials")
-    if not pwd_context.verify(body.password, user['password']):
+    password_ok, new_hash = await verify_password_async(body.password, user['password'])
+    if not password_ok:
         raise HTTPException(status_code=401, detail="Incorrect password")
+    if new_hash:
+        await anyio.to_thread.run_sync(
+            _execute_and_commit, db,
+            "UPDATE users SET password = %s WHERE id = %s", (new_hash, user["id"]),
+        )
     if not user["email_verified"]:
         raise HTTPException(status_code=403, detail="Email not verified")
     if user["role"] in ["owner", "agent", "tenant"] and not user["is_active"]:
@@ -184,39 +500,35 @@ def login_user(body: LoginRequest):
         SECRET_KEY,
         algorithm=ALGORITHM,
     )
-    return {
-        "token": token,
-        "user": {
-            "id": user["id"],
-            "email": user["email"],
-            "first_name": user["first_name"],
-            "last_name": user["last_name"],
-            "role": user["role"],
-        },
-    }
+    # The row already holds exactly the public fields once the auth-only
+    # columns are dropped; return it as-is rather than copying it
+    del user["password"], user["email_verified"], user["is_active"]
+    return {"token": token, "user": user}
 
 @app.put("/api/users/avatar")
-def update_avatar(avatar: UploadFile = File(...), token: dict = Depends(verify_token)):
+def update_avatar(avatar: UploadFile = File(...), token: dict = Depends(verify_token), db: Any = Depends(get_db)):
     user_id = token.get("id")
-    filename = f"{int(time.time())}-{avatar.filename.replace(' ', '_')}"
+    ext = os.path.splitext(avatar.filename or "")[1].lower()
+    if ext not in AVATAR_EXTENSIONS:
+        raise HTTPException(status_code=400, detail="Avatar must be a PNG, JPEG or WebP image")
+    check_upload_size(avatar, MAX_AVATAR_BYTES)
+    # Random name: no collisions between concurrent uploads and nothing
+    # user-controlled in the path
+    filename = secrets.token_hex(16) + ext
     file_path = os.path.join(UPLOAD_DIR, filename)
-    with open(file_path, "wb") as buffer:
-        shutil.copyfileobj(avatar.file, buffer)
-    db = get_db()
+    copy_upload(avatar.file, file_path)
     cursor = db.cursor()
-    cursor.execute("UPDATE users SET avatar = %s WHERE id = %s", (f"/uploads/{filename}", user_id))
+    execute_prepared(
+        cursor,
+        "UPDATE users SET avatar = @p1 WHERE id = @p2",
+        "@p1 nvarchar(500), @p2 int",
+        (f"/uploads/{filename}", user_id),
+    )
     db.commit()
     return {"avatar": f"/uploads/{filename}"}
 
 @app.put("/api/users/{user_id}")
-def update_user_profile(user_id: int, firstName: Optional[str] = Form(None), lastName: Optional[str] = Form(None), email: Optional[str] = Form(None), password: Optional[str] = Form(None), currentPassword: Optional[str] = Form(None), token: dict = Depends(verify_token)):
-    db = get_db()
-    cursor = db.cursor()
-    cursor.execute("SELECT password FROM users WHERE id = %s", (user_id,))
-    row = cursor.fetchone()
-    if not row:
-        raise HTTPException(status_code=404, detail="User not found")
-    stored_hashed_password = row[0]
+async def update_user_profile(user_id: int, firstName: Optional[str] = Form(None), lastName: Optional[str] = Form(None), email: Optional[str] = Form(None), password: Optional[str] = Form(None), currentPassword: Optional[str] = Form(None), token: dict = Depends(verify_token), db: Any = Depends(get_db)):
     updates = []
     params = []
     if firstName and lastName:
@@ -226,16 +538,24 @@ def update_user_profile(user_id: int, firstName: Optional[str] = Form(None), las
         updates.append("email = %s")
         params.append(email)
     if currentPassword and password and currentPassword != password:
-        if not pwd_context.verify(currentPassword, stored_hashed_password):
+        # Only a password change needs the stored hash
+        stored_hashed_password = await anyio.to_thread.run_sync(_fetch_password_hash, db, user_id)
+        if stored_hashed_password is None:
+            raise HTTPException(status_code=404, detail="User not found")
+        if not (await verify_password_async(currentPassword, stored_hashed_password))[0]:
             raise HTTPException(status_code=401, detail="Incorrect current password")
-        new_hashed = pwd_context.hash(password)
+        new_hashed = await hash_password_async(password)
         updates.append("password = %s")
         params.append(new_hashed)
     if not updates:
         raise HTTPException(status_code=400, detail="No fields to update")
     params.append(user_id)
-    cursor.execute(f"UPDATE users SET {', '.join(updates)} WHERE id = %s", tuple(params))
-    db.commit()
+    updated = await anyio.to_thread.run_sync(
+        _execute_and_commit, db,
+        f"UPDATE users SET {', '.join(updates)} WHERE id = %s", tuple(params),
+    )
+    if not updated:
+        raise HTTPException(status_code=404, detail="User not found")
     return {"success": True}
 
 @app.put("/api/maintenance-requests/{request_id}")
@@ -243,11 +563,11 @@ def update_maintenance_request(
     request_id: int,
     body: MaintenanceDecision,
     token: dict = Depends(verify_token),
+    db: Any = Depends(get_db),
 ):
     role = token.get("role")
     if role not in ["admin", "manager"]:
         raise HTTPException(status_code=403, detail="Unauthorized")
-    db = get_db()
     cursor = db.cursor()
     try:
         cursor.execute("""
@@ -286,24 +606,17 @@ def complete_maintenance_request(
     warranty_info: Optional[str] = Form(None),
     invoice: Optional[UploadFile] = File(None),
     token: dict = Depends(verify_token),
+    db: Any = Depends(get_db),
 ):
     role = token.get("role")
     if role not in ["admin", "manager"]:
         raise HTTPException(status_code=403, detail="Unauthorized")
-    db = get_db()
+    if invoice:
+        check_upload_size(invoice, MAX_UPLOAD_BYTES)
     cursor = db.cursor()
     try:
-        cursor.execute("""
-            SELECT status FROM maintenance_requests WHERE id = %s
-        """, (request_id,))
-        row = cursor.fetchone()
-        if not row:
-            raise HTTPException(status_code=404, detail="Maintenance request not found")
-        if row[0] != "ongoing":
-            raise HTTPException(
-                status_code=400,
-                detail="Only ongoing requests can be completed"
-            )
+        # Conditional UPDATE: the happy path is one round-trip; only a miss
+        # pays for the lookup that picks between 404 and 400
         cursor.execute("""
             UPDATE maintenance_requests
             SET
@@ -313,20 +626,29 @@ def complete_maintenance_request(
                 total_cost = %s,
                 warranty_info = %s,
                 updated_at = GETDATE()
-            WHERE id = %s
+            WHERE id = %s AND status = 'ongoing'
         """, (
             resolution_summary,
             total_cost,
             warranty_info,
             request_id
         ))
+        if cursor.rowcount == 0:
+            cursor.execute("""
+                SELECT status FROM maintenance_requests WHERE id = %s
+            """, (request_id,))
+            if not cursor.fetchone():
+                raise HTTPException(status_code=404, detail="Maintenance request not found")
+            raise HTTPException(
+                status_code=400,
+                detail="Only ongoing requests can be completed"
+            )
 
         if invoice:
             ext = os.path.splitext(invoice.filename)[-1]
             filename = f"invoice_{uuid.uuid4()}{ext}"
             file_path = os.path.join(UPLOAD_DIR, filename)
-            with open(file_path, "wb") as buffer:
-                shutil.copyfileobj(invoice.file, buffer)
+            copy_upload(invoice.file, file_path)
             cursor.execute("""
                 INSERT INTO maintenance_attachments
                 (request_id, file_url, file_type, uploaded_at)
@@ -349,11 +671,10 @@ def complete_maintenance_request(
         raise HTTPException(status_code=500, detail="Failed to complete maintenance request")
     
 @app.get("/api/maintenance-completed/{request_id}")
-def get_completed_maintenance_request_by_id(request_id: int, token: dict = Depends(verify_token)):
-    db = get_db()
+def get_completed_maintenance_request_by_id(request_id: int, token: dict = Depends(verify_token), db: Any = Depends(get_db)):
     cursor = db.cursor(as_dict=True)
     try:
-        cursor.execute("""
+        execute_prepared(cursor, """
             SELECT 
                 mr.id AS maintenance_request_id,
                 mr.tenant_id,
@@ -370,44 +691,38 @@ def get_completed_maintenance_request_by_id(request_id: int, token: dict = Depen
                 mr.total_cost,
                 mr.warranty_info,
                 mr.created_at,
-                mr.updated_at
+                mr.updated_at,
+                ma.id AS attachment_id,
+                ma.file_url,
+                ma.file_type,
+                ma.uploaded_at
             FROM maintenance_requests mr
             JOIN users u ON u.id = mr.tenant_id
-            WHERE mr.id = %s
-        """, (request_id,))
-        result = cursor.fetchone()
-        if not result:
+            LEFT JOIN maintenance_attachments ma ON ma.request_id = mr.id
+            WHERE mr.id = @p1
+        """, "@p1 int", (request_id,))
+        rows = cursor.fetchall()
+        if not rows:
             raise HTTPException(status_code=404, detail="Maintenance request not found")
-        cursor.execute("""
-            SELECT 
-                id AS attachment_id,
-                file_url,
-                file_type,
-                uploaded_at
-            FROM maintenance_attachments
-            WHERE request_id = %s
-        """, (request_id,))
-        attachments = cursor.fetchall()
-        result["attachments"] = attachments
-        return result
+        return fold_attachments(rows)
     except Exception as e:
         print("Error fetching request by ID:", str(e))
         raise HTTPException(status_code=500, detail="Failed to fetch maintenance request")
     
 @app.post("/api/announcements")
-async def create_announcement(
+def create_announcement(
     title: str = Form(...),
     description: str = Form(...),
     file: UploadFile = File(None),
-    token: dict = Depends(verify_token)
+    token: dict = Depends(verify_token),
+    db: Any = Depends(get_db),
 ):
     user_id = token.get("id")
-    db = get_db()
     cursor = db.cursor(as_dict=True)
     file_url = None
     if file:
         file.file.seek(0)
-        file_url = upload_to_blob(file, "announcements")
+        file_url = anyio.from_thread.run(upload_to_blob, file, "announcements", user_id)
     try:
         cursor.execute("""
             INSERT INTO post_announcements (
@@ -418,18 +733,12 @@ async def create_announcement(
                 created_at,
                 is_archived
             )
-            OUTPUT INSERTED.id
+            OUTPUT INSERTED.*
             VALUES (%s, %s, %s, %s, SYSDATETIME(), 0)
         """, (title, description, file_url, user_id))
-        ann_id = cursor.fetchone()["id"]
+        new_post = cursor.fetchone()
         db.commit()
-        cursor.execute(
-            "SELECT * FROM post_announcements WHERE id = %s",
-            (ann_id,)
-        )
-        row = cursor.fetchone()
-        new_post = clean_row(row)
-        await ws_manager.broadcast({
+        anyio.from_thread.run(ws_manager.broadcast, {
             "event": "new_announcement",
             "data": new_post
         })
@@ -439,18 +748,18 @@ async def create_announcement(
         raise HTTPException(status_code=500, detail="Failed to post announcements")
 
 @app.put("/api/announcements/{announcement_id}")
-async def update_announcement(
+def update_announcement(
     announcement_id: int,
     title: str = Form(...),
     description: str = Form(...),
     file: UploadFile = File(None),
     token: dict = Depends(verify_token),
+    db: Any = Depends(get_db),
 ):
     user_id = token.get("id")
-    db = get_db()
     cursor = db.cursor(as_dict=True)
     cursor.execute(
-        "SELECT * FROM post_announcements WHERE id=%s AND user_id=%s",
+        "SELECT file_url FROM post_announcements WHERE id=%s AND user_id=%s",
         (announcement_id, user_id),
     )
     existing = cursor.fetchone()
@@ -459,7 +768,7 @@ async def update_announcement(
     file_url = existing["file_url"]
     if file:
         file.file.seek(0)
-        file_url = upload_to_blob(file, "announcements")
+        file_url = anyio.from_thread.run(upload_to_blob, file, "announcements", user_id)
     cursor.execute(
         """
         UPDATE post_announcements
@@ -467,27 +776,26 @@ async def update_announcement(
             description=%s,
             file_url=%s,
             updated_at=GETDATE()
+        OUTPUT INSERTED.*
         WHERE id=%s
         """,
         (title, description, file_url, announcement_id),
     )
-    db.commit()
-    cursor.execute("SELECT * FROM post_announcements WHERE id=%s", (announcement_id,))
     updated = cursor.fetchone()
-    updated = clean_row(updated)
-    await ws_manager.broadcast({
+    db.commit()
+    anyio.from_thread.run(ws_manager.broadcast, {
         "event": "update_announcement",
         "data": updated
     })
     return updated
 
 @app.delete("/api/announcements/{announcement_id}")
-async def archive_announcement(
+def archive_announcement(
     announcement_id: int,
-    token: dict = Depends(verify_token)
+    token: dict = Depends(verify_token),
+    db: Any = Depends(get_db),
 ):
     user_id = token.get("id")
-    db = get_db()
     cursor = db.cursor(as_dict=True)
     cursor.execute("""
         SELECT id
@@ -505,7 +813,7 @@ async def archive_announcement(
             WHERE id = %s
         """, (announcement_id,))
         db.commit()
-        await ws_manager.broadcast({
+        anyio.from_thread.run(ws_manager.broadcast, {
             "event": "archive_announcement",
             "data": { "id": announcement_id }
         })
@@ -515,24 +823,20 @@ async def archive_announcement(
         raise HTTPException(status_code=500, detail="Archive failed")
 
 @app.get("/api/announcements")
-def get_announcements(token: dict = Depends(verify_token)):
+def get_announcements(token: dict = Depends(verify_token), db: Any = Depends(get_db)):
     user_id = token.get("id")
-    db = get_db()
     cursor = db.cursor(as_dict=True)
-    cursor.execute("""
+    execute_prepared(cursor, """
         SELECT * FROM post_announcements
-        WHERE user_id = %s AND is_archived = 0
+        WHERE user_id = @p1 AND is_archived = 0
         ORDER BY created_at DESC
-    """, (user_id,))
+    """, "@p1 int", (user_id,))
     return cursor.fetchall()
 
 router = APIRouter()
 
-UPLOAD_DIR = "uploads/ids"
-os.makedirs(UPLOAD_DIR, exist_ok=True)
-
-@router.post("/api/tenants")
-async def create_tenant(
+@router.post("/api/tenants", dependencies=[Depends(invalidates_lists)])
+def create_tenant(
     lastName: str = Form(...),
     firstName: str = Form(...),
     email: str = Form(...),
@@ -549,29 +853,31 @@ async def create_tenant(
     emergencyContactName: str = Form(...),
     emergencyContactNumber: str = Form(...),
     token: dict = Depends(verify_token),
+    db: Any = Depends(get_db),
 ):
-    db = get_db()
     cursor = db.cursor(as_dict=True)
-    cursor.execute("SELECT id FROM users WHERE email = %s", (email,))
+    execute_prepared(cursor, "SELECT id FROM users WHERE email = @p1", "@p1 nvarchar(255)", (email,))
     existing_user = cursor.fetchone()
     if existing_user:
         raise HTTPException(status_code=400, detail="Email already has an account")
     extension = os.path.splitext(idDocument.filename)[-1]
     filename = f"{uuid4()}{extension}"
-    file_path = os.path.join("uploads", "id", "tenants", filename)
-    os.makedirs(os.path.dirname(file_path), exist_ok=True)
-    with open(file_path, "wb") as buffer:
-        shutil.copyfileobj(idDocument.file, buffer)
+    file_path = os.path.join(TENANT_ID_DIR, filename)
+    copy_upload(idDocument.file, file_path)
     try:
-        temp_password = pwd_context.hash("changeme123")
-        cursor.execute("""
+        temp_password = hash_password("changeme123")
+        # Both inserts in one batch: a single round trip, and the tenant row
+        # picks up the new user id server-side. Run through sp_executesql so
+        # SET NOCOUNT is scoped to this call: it reverts when the call ends,
+        # even if the batch aborts partway, and never sticks to the pooled
+        # connection (where later rowcount checks would all read -1).
+        execute_prepared(cursor, """
+            SET NOCOUNT ON;
+            DECLARE @ids TABLE (id int);
             INSERT INTO users (first_name, last_name, email, password, role, created_at)
-            VALUES (%s, %s, %s, %s, 'tenant', GETDATE())
-        """, (firstName, lastName, email, temp_password))
-        db.commit()
-        cursor.execute("SELECT @@IDENTITY AS id")
-        new_user_id = cursor.fetchone()["id"]
-        cursor.execute("""
+            OUTPUT INSERTED.id INTO @ids
+            VALUES (@p1, @p2, @p3, @p4, 'tenant', GETDATE());
+            DECLARE @uid int = (SELECT id FROM @ids);
             INSERT INTO tenants (
                 user_id, last_name, first_name, email, contact_number,
                 street, barangay, city, province,
@@ -579,14 +885,20 @@ async def create_tenant(
                 occupation_status, occupation_place,
                 emergency_contact_name, emergency_contact_number,
                 created_at, updated_at
-            ) VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, GETDATE(), GETDATE())
+            ) VALUES (@uid, @p2, @p1, @p3, @p5, @p6, @p7, @p8, @p9, @p10, @p11, @p12, @p13, @p14, @p15, @p16, GETDATE(), GETDATE());
+            SELECT @uid AS id;
         """, (
-            new_user_id, lastName, firstName, email, contactNumber,
-            street, barangay, city, province,
-            idType, idNumber, filename,
+            # Wider than any column, so over-long input still fails the
+            # INSERT instead of being silently cut to the parameter size
+            ", ".join(f"@p{i} nvarchar(4000)" for i in range(1, 17))
+        ), (
+            firstName, lastName, email, temp_password,
+            contactNumber, street, barangay, city,
+            province, idType, idNumber, filename,
             occupationStatus, occupationPlace,
             emergencyContactName, emergencyContactNumber
         ))
+        new_user_id = cursor.fetchone()["id"]
         db.commit()
         return {"message": "Tenant created successfully", "user_id": new_user_id}
     except Exception as e:
@@ -594,8 +906,8 @@ async def create_tenant(
         print("TenantInsert Error:", str(e))
         raise HTTPException(status_code=500, detail="Failed to create tenant. Please try again.")
     
-@router.put("/api/tenants/{tenant_id}")
-async def update_tenant(
+@router.put("/api/tenants/{tenant_id}", dependencies=[Depends(invalidates_lists)])
+def update_tenant(
     tenant_id: int,
     lastName: str = Form(...),
     firstName: str = Form(...),
@@ -613,10 +925,10 @@ async def update_tenant(
     emergencyContactNumber: str = Form(...),
     idDocument: UploadFile = File(None),
     token: dict = Depends(verify_token),
+    db: Any = Depends(get_db),
 ):
-    db = get_db()
     cursor = db.cursor(as_dict=True)
-    cursor.execute("SELECT * FROM tenants WHERE id = %s", (tenant_id,))
+    cursor.execute("SELECT id_document FROM tenants WHERE id = %s", (tenant_id,))
     tenant = cursor.fetchone()
     if not tenant:
         raise HTTPException(404, "Tenant not found")
@@ -624,10 +936,9 @@ async def update_tenant(
     if idDocument:
         ext = os.path.splitext(idDocument.filename)[-1]
         filename = f"{uuid4()}{ext}"
-        upload_path = f"uploads/id/tenants/{filename}"
-        with open(upload_path, "wb") as f:
-            shutil.copyfileobj(idDocument.file, f)
-        old_path = f"uploads/id/tenants/{tenant['id_document']}"
+        upload_path = os.path.join(TENANT_ID_DIR, filename)
+        copy_upload(idDocument.file, upload_path)
+        old_path = os.path.join(TENANT_ID_DIR, tenant['id_document'])
         if os.path.exists(old_path):
             os.remove(old_path)
         new_doc = filename
@@ -656,16 +967,16 @@ async def update_tenant(
         db.rollback()
         raise HTTPException(500, f"Update failed: {e}")
     
-@router.put("/api/tenants/{tenant_id}/status")
-async def update_tenant_status(
+@router.put("/api/tenants/{tenant_id}/status", dependencies=[Depends(invalidates_lists)])
+def update_tenant_status(
     tenant_id: int,
     body: TenantStatusUpdate,
-    token: dict = Depends(verify_token)
+    token: dict = Depends(verify_token),
+    db: Any = Depends(get_db),
 ):
-    db = get_db()
     cursor = db.cursor(as_dict=True)
     cursor.execute("""
-        SELECT t.*, u.id AS user_id
+        SELECT u.id AS user_id
         FROM tenants t
         JOIN users u ON u.id = t.user_id
         WHERE t.tenant_id = %s
@@ -699,16 +1010,16 @@ async def update_tenant_status(
         db.rollback()
         raise HTTPException(500, str(e))
     
-@router.put("/api/owners/{owner_id}/status")
-async def update_owner_status(
+@router.put("/api/owners/{owner_id}/status", dependencies=[Depends(invalidates_lists)])
+def update_owner_status(
     owner_id: int,
     body: OwnerStatusUpdate,
-    token: dict = Depends(verify_token)
+    token: dict = Depends(verify_token),
+    db: Any = Depends(get_db),
 ):
-    db = get_db()
     cursor = db.cursor(as_dict=True)
     cursor.execute("""
-        SELECT po.*, u.id AS user_id
+        SELECT u.id AS user_id
         FROM property_owners po
         JOIN users u ON u.id = po.user_id
         WHERE po.owner_id = %s
@@ -742,16 +1053,15 @@ async def update_owner_status(
         db.rollback()
         raise HTTPException(500, str(e))
     
-@router.delete("/api/tenants/{tenant_id}")
-async def delete_tenant(tenant_id: int, token: dict = Depends(verify_token)):
-    db = get_db()
+@router.delete("/api/tenants/{tenant_id}", dependencies=[Depends(invalidates_lists)])
+def delete_tenant(tenant_id: int, token: dict = Depends(verify_token), db: Any = Depends(get_db)):
     cursor = db.cursor(as_dict=True)
-    cursor.execute("SELECT * FROM tenants WHERE id=%s", (tenant_id,))
+    cursor.execute("SELECT user_id, id_document FROM tenants WHERE id=%s", (tenant_id,))
     tenant = cursor.fetchone()
     if not tenant:
         raise HTTPException(404, "Tenant not found")
     try:
-        file_path = f"uploads/id/tenants/{tenant['id_document']}"
+        file_path = os.path.join(TENANT_ID_DIR, tenant['id_document'])
         if os.path.exists(file_path):
             os.remove(file_path)
         cursor.execute("DELETE FROM tenants WHERE id=%s", (tenant_id,))
@@ -762,8 +1072,9 @@ async def delete_tenant(tenant_id: int, token: dict = Depends(verify_token)):
         db.rollback()
         raise HTTPException(500, f"Delete failed: {e}")
     
-@router.post("/api/register")
-async def register_user(
+@router.post("/api/register", dependencies=[Depends(invalidates_lists)])
+def register_user(
+    background_tasks: BackgroundTasks,
     lastName: str = Form(...),
     firstName: str = Form(...),
     email: str = Form(...),
@@ -783,14 +1094,14 @@ async def register_user(
     emergencyContactNumber: str = Form(None),
     bankAssociated: str = Form(None),
     bankAccountNumber: str = Form(None),
+    db: Any = Depends(get_db),
 ):
-    db = get_db()
     cursor = db.cursor(as_dict=True)
     try:
-        cursor.execute("SELECT id FROM users WHERE email = %s", (email,))
+        execute_prepared(cursor, "SELECT id FROM users WHERE email = @p1", "@p1 nvarchar(255)", (email,))
         if cursor.fetchone():
             raise HTTPException(status_code=400, detail="Email already registered")
-        password_hash = pwd_context.hash(password)
+        password_hash = hash_password(password)
         otp = str(random.randint(100000, 999999))
         otp_expiry = datetime.utcnow() + timedelta(minutes=10)
 
@@ -809,7 +1120,7 @@ async def register_user(
         id_url = None
         if idDocument:
             container = "tenantiddocuments" if role == "tenant" else "owneriddocuments"
-            id_url = upload_to_blob(idDocument, container, user_id)
+            id_url = anyio.from_thread.run(upload_to_blob, idDocument, container, user_id)
         if role == "tenant":
             cursor.execute("""
                 INSERT INTO tenants (
@@ -847,10 +1158,7 @@ async def register_user(
                 bankAssociated, bankAccountNumber
             ))
         db.commit()
-        try:
-            send_otp_email(email, otp)
-        except Exception as email_error:
-            print("EMAIL ERROR:", str(email_error))
+        background_tasks.add_task(send_otp_email_background, email, otp)
         return {
             "success": True,
             "message": "Registration successful. Please verify your email.",
@@ -864,8 +1172,7 @@ async def register_user(
         raise HTTPException(status_code=500, detail="Registration failed")
 
 @router.post("/api/verify-email")
-def verify_email(payload: VerifyEmailRequest):
-    db = get_db()
+def verify_email(payload: VerifyEmailRequest, db: Any = Depends(get_db)):
     cursor = db.cursor(as_dict=True)
     cursor.execute("""
         SELECT id, pending_otp, otp_expires_at
@@ -893,8 +1200,7 @@ def verify_email(payload: VerifyEmailRequest):
     }
     
 @router.post("/api/resend-otp")
-def resend_otp(payload: ResendOTPRequest):
-    db = get_db()
+def resend_otp(payload: ResendOTPRequest, background_tasks: BackgroundTasks, db: Any = Depends(get_db)):
     cursor = db.cursor(as_dict=True)
     otp = str(random.randint(100000, 999999))
     expiry = datetime.utcnow() + timedelta(minutes=10)
@@ -907,11 +1213,11 @@ def resend_otp(payload: ResendOTPRequest):
     if cursor.rowcount == 0:
         raise HTTPException(400, "Invalid email or already verified")
     db.commit()
-    send_otp_email(payload.email, otp)
+    background_tasks.add_task(send_otp_email_background, payload.email, otp)
     return {"success": True, "message": "OTP resent"}
     
-@router.post("/api/property-owners")
-async def create_property_owner(
+@router.post("/api/property-owners", dependencies=[Depends(invalidates_lists)])
+def create_property_owner(
     lastName: str = Form(...),
     firstName: str = Form(...),
     email: str = Form(...),
@@ -925,29 +1231,25 @@ async def create_property_owner(
     idDocument: UploadFile = File(...),
     bankAssociated: str = Form(...),
     bankAccountNumber: str = Form(...),
-    token: dict = Depends(verify_token)
+    token: dict = Depends(verify_token),
+    db: Any = Depends(get_db),
 ):
-    db = get_db()
     cursor = db.cursor(as_dict=True)
-    cursor.execute("SELECT id FROM users WHERE email = %s", (email,))
+    execute_prepared(cursor, "SELECT id FROM users WHERE email = @p1", "@p1 nvarchar(255)", (email,))
     existing_user = cursor.fetchone()
     if existing_user:
         raise HTTPException(status_code=400, detail="Email already has an account")
-    temp_password = pwd_context.hash("changeme123")
+    temp_password = hash_password("changeme123")
     cursor.execute("""
         INSERT INTO users (first_name, last_name, email, password, role, created_at)
+        OUTPUT INSERTED.id
         VALUES (%s, %s, %s, %s, 'owner', GETDATE())
     """, (firstName, lastName, email, temp_password))
-    db.commit()
-    cursor.execute("SELECT @@IDENTITY AS id")
     user_id = cursor.fetchone()["id"]
-    upload_dir = "uploads/id/property-owners"
-    os.makedirs(upload_dir, exist_ok=True)
     file_extension = idDocument.filename.split(".")[-1]
     new_filename = f"owner_{user_id}_{uuid.uuid4()}.{file_extension}"
-    file_path = os.path.join(upload_dir, new_filename)
-    with open(file_path, "wb") as f:
-        f.write(await idDocument.read())
+    file_path = os.path.join(OWNER_ID_DIR, new_filename)
+    copy_upload(idDocument.file, file_path)
     saved_file_path = f"/uploads/id/property-owners/{new_filename}"
     try:
         cursor.execute("""
@@ -978,8 +1280,8 @@ async def create_property_owner(
         print(" Property Owner Insert Error:", str(e))
         raise HTTPException(status_code=500, detail="Failed to create property owner. Please try again.")
     
-@router.put("/api/property-owners/{owner_id}")
-async def update_property_owner(
+@router.put("/api/property-owners/{owner_id}", dependencies=[Depends(invalidates_lists)])
+def update_property_owner(
     owner_id: int,
     lastName: str = Form(...),
     firstName: str = Form(...),
@@ -994,11 +1296,11 @@ async def update_property_owner(
     bankAssociated: str = Form(...),
     bankAccountNumber: str = Form(...),
     idDocument: UploadFile = File(None),
-    token: dict = Depends(verify_token)
+    token: dict = Depends(verify_token),
+    db: Any = Depends(get_db),
 ):
-    db = get_db()
     cursor = db.cursor(as_dict=True)
-    cursor.execute("SELECT * FROM property_owners WHERE owner_id=%s", (owner_id,))
+    cursor.execute("SELECT id_document FROM property_owners WHERE owner_id=%s", (owner_id,))
     owner = cursor.fetchone()
     if not owner:
         raise HTTPException(404, "Owner not found")
@@ -1006,10 +1308,9 @@ async def update_property_owner(
     if idDocument:
         ext = os.path.splitext(idDocument.filename)[-1]
         filename = f"owner_{owner_id}_{uuid4()}{ext}"
-        upload_path = f"uploads/id/property-owners/{filename}"
-        with open(upload_path, "wb") as f:
-            f.write(await idDocument.read())
-        old_path = owner["id_document"].lstrip("/")
+        upload_path = os.path.join(OWNER_ID_DIR, filename)
+        copy_upload(idDocument.file, upload_path)
+        old_path = os.path.join(OWNER_ID_DIR, os.path.basename(owner["id_document"]))
         if os.path.exists(old_path):
             os.remove(old_path)
         new_doc = f"/uploads/id/property-owners/{filename}"
@@ -1035,16 +1336,15 @@ async def update_property_owner(
         db.rollback()
         raise HTTPException(500, f"Update failed: {e}")
     
-@router.delete("/api/property-owners/{owner_id}")
-async def delete_property_owner(owner_id: int, token: dict = Depends(verify_token)):
-    db = get_db()
+@router.delete("/api/property-owners/{owner_id}", dependencies=[Depends(invalidates_lists)])
+def delete_property_owner(owner_id: int, token: dict = Depends(verify_token), db: Any = Depends(get_db)):
     cursor = db.cursor(as_dict=True)
-    cursor.execute("SELECT * FROM property_owners WHERE owner_id=%s", (owner_id,))
+    cursor.execute("SELECT user_id, id_document FROM property_owners WHERE owner_id=%s", (owner_id,))
     owner = cursor.fetchone()
     if not owner:
         raise HTTPException(404, "Owner not found")
     try:
-        old_doc = owner["id_document"].lstrip("/")
+        old_doc = os.path.join(OWNER_ID_DIR, os.path.basename(owner["id_document"]))
         if os.path.exists(old_doc):
             os.remove(old_doc)
         cursor.execute("DELETE FROM property_owners WHERE owner_id=%s", (owner_id,))
@@ -1055,7 +1355,7 @@ async def delete_property_owner(owner_id: int, token: dict = Depends(verify_toke
         db.rollback()
         raise HTTPException(500, f"Delete failed: {e}")
     
-@router.post("/api/properties")
+@router.post("/api/properties", dependencies=[Depends(invalidates_lists)])
 async def create_property(
     propertyName: str = Form(...),
     registeredOwner: str = Form(...),
@@ -1069,87 +1369,93 @@ async def create_property(
     units: int = Form(...),
     selectedFeatures: str = Form(""),
     propertyImages: List[UploadFile] = File([]),
-    token: dict = Depends(verify_token)
+    token: dict = Depends(verify_token),
+    db: Any = Depends(get_db),
 ):
-    upload_dir = "uploads/properties"
-    os.makedirs(upload_dir, exist_ok=True)
     saved_images = []
+    saves = []
     for img in propertyImages:
         ext = img.filename.split(".")[-1]
         filename = f"prop_{uuid.uuid4()}.{ext}"
-        filepath = os.path.join(upload_dir, filename)
-        with open(filepath, "wb") as f:
-            f.write(await img.read())
+        saves.append(save_upload(img, os.path.join(PROPERTY_IMAGE_DIR, filename)))
         saved_images.append(f"/uploads/properties/{filename}")
-        
-    db = get_db()
-    cursor = db.cursor(as_dict=True)
-    cursor.execute("""
-        SELECT id FROM properties
-        WHERE property_name = %s
-        AND registered_owner = %s
-        AND street = %s
-        AND barangay = %s
-        AND city = %s
-        AND province = %s
-    """, (
-        propertyName,
-        registeredOwner,
-        street,
-        barangay,
-        city,
-        province
-    ))
-    existing = cursor.fetchone()
-    if existing:
-        raise HTTPException(
-            status_code=400,
-            detail="Property already exists for this owner and address."
-        )
-    try:
+    # Each save runs in its own threadpool thread; write them in parallel
+    await asyncio.gather(*saves)
+
+    # pymssql blocks: run the DB work in the threadpool, off the event loop
+    def write():
+        cursor = db.cursor(as_dict=True)
         cursor.execute("""
-            INSERT INTO properties (
-                property_name, registered_owner, area_measurement,
-                description, street, barangay, city,
-                province, property_notes, units, selected_features,
-                created_at
-            ) VALUES (
-                %s, %s, %s,
-                %s, %s, %s, %s,
-                %s, %s, %s, %s,
-                GETDATE()
-            )
+            SELECT id FROM properties
+            WHERE property_name = %s
+            AND registered_owner = %s
+            AND street = %s
+            AND barangay = %s
+            AND city = %s
+            AND province = %s
         """, (
-            propertyName, registeredOwner, areaMeasurement,
-            description, street, barangay, city,
-            province, propertyNotes, units, selectedFeatures
+            propertyName,
+            registeredOwner,
+            street,
+            barangay,
+            city,
+            province
         ))
-        db.commit()
-        cursor.execute("SELECT @@IDENTITY AS id")
-        property_id = cursor.fetchone()["id"]
-    except Exception as e:
-        db.rollback()
-        print("Property Insert Error →", e)
-        raise HTTPException(status_code=500, detail="Failed to save property details")
-    try:
-        for i in range(1, units + 1):
+        existing = cursor.fetchone()
+        if existing:
+            raise HTTPException(
+                status_code=400,
+                detail="Property already exists for this owner and address."
+            )
+        try:
             cursor.execute("""
-                INSERT INTO property_units (property_id, unit_number, status, created_at, updated_at)
-                VALUES (%s, %s, 'vacant', GETDATE(), GETDATE())
-            """, (property_id, f"Unit {i}"))
-        db.commit()
-    except Exception as e:
-        db.rollback()
-        print("Unit Insert Error →", e)
-    return {
-        "success": True,
-        "message": "Property created successfully",
-        "property_id": property_id,
-        "uploaded_images": saved_images,
-    }
+                INSERT INTO properties (
+                    property_name, registered_owner, area_measurement,
+                    description, street, barangay, city,
+                    province, property_notes, units, selected_features,
+                    created_at
+                ) OUTPUT INSERTED.id VALUES (
+                    %s, %s, %s,
+                    %s, %s, %s, %s,
+                    %s, %s, %s, %s,
+                    GETDATE()
+                )
+            """, (
+                propertyName, registeredOwner, areaMeasurement,
+                description, street, barangay, city,
+                province, propertyNotes, units, selectedFeatures
+            ))
+            property_id = cursor.fetchone()["id"]
+            db.commit()
+        except Exception as e:
+            db.rollback()
+            print("Property Insert Error →", e)
+            raise HTTPException(status_code=500, detail="Failed to save property details")
+        try:
+            # Multi-row INSERTs instead of one round-trip per unit; a VALUES
+            # list is capped at 1000 rows
+            for start in range(1, units + 1, 1000):
+                numbers = range(start, min(start + 1000, units + 1))
+                cursor.execute(
+                    "INSERT INTO property_units (property_id, unit_number, status, created_at, updated_at) VALUES "
+                    + ", ".join(["(%s, %s, 'vacant', GETDATE(), GETDATE())"] * len(numbers)),
+                    tuple(v for i in numbers for v in (property_id, f"Unit {i}")),
+                )
+            db.commit()
+        except Exception as e:
+            db.rollback()
+            print("Unit Insert Error →", e)
+        return {
+            "success": True,
+            "message": "Property created successfully",
+            "property_id": property_id,
+            "uploaded_images": saved_images,
+        }
+
+    return await anyio.to_thread.run_sync(write)
     
-@router.put("/api/properties/{property_id}")
-async def update_property(
+@router.put("/api/properties/{property_id}", dependencies=[Depends(invalidates_lists)])
+def update_property(
     property_id: int,
     propertyName: str = Form(...),
     registeredOwner: str = Form(...),
@@ -1163,51 +1469,52 @@ async def update_property(
     units: int = Form(...),
     selectedFeatures: str = Form(""),
     token: dict = Depends(verify_token),
+    db: Any = Depends(get_db),
 ):
-    db = get_db()
     cursor = db.cursor(as_dict=True)
-    cursor.execute("SELECT * FROM properties WHERE id=%s", (property_id,))
-    prop = cursor.fetchone()
-    if not prop:
-        raise HTTPException(404, "Property not found")
-    cursor.execute("""
-        SELECT id FROM properties
-        WHERE property_name=%s AND registered_owner=%s AND
-            street=%s AND barangay=%s AND city=%s AND province=%s
-            AND id != %s
-    """, (
-        propertyName, registeredOwner,
-        street, barangay, city, province,
-        property_id
-    ))
-    dup = cursor.fetchone()
-    if dup:
-        raise HTTPException(400, "Another property already exists with this address")
     try:
+        # Duplicate-address check and update in one statement; the range locks
+        # keep a concurrent write from claiming the same address in between
         cursor.execute("""
             UPDATE properties SET
                 property_name=%s, registered_owner=%s, area_measurement=%s,
                 description=%s, street=%s, barangay=%s, city=%s, province=%s,
                 property_notes=%s, units=%s, selected_features=%s,
                 updated_at=GETDATE()
-            WHERE id=%s
+            WHERE id=%s AND NOT EXISTS (
+                SELECT 1 FROM properties WITH (UPDLOCK, HOLDLOCK)
+                WHERE property_name=%s AND registered_owner=%s AND
+                    street=%s AND barangay=%s AND city=%s AND province=%s
+                    AND id != %s
+            )
         """, (
             propertyName, registeredOwner, areaMeasurement,
             description, street, barangay, city, province,
             propertyNotes, units, selectedFeatures,
+            property_id,
+            propertyName, registeredOwner,
+            street, barangay, city, province,
             property_id
         ))
+        if cursor.rowcount == 0:
+            db.rollback()
+            # Nothing updated: tell a missing property apart from a duplicate
+            cursor.execute("SELECT id FROM properties WHERE id=%s", (property_id,))
+            if cursor.fetchone() is None:
+                raise HTTPException(404, "Property not found")
+            raise HTTPException(400, "Another property already exists with this address")
         db.commit()
         return {"message": "Property updated successfully"}
+    except HTTPException:
+        raise
     except Exception as e:
         db.rollback()
         raise HTTPException(500, f"Update failed: {e}")
     
-@router.delete("/api/properties/{property_id}")
-async def delete_property(property_id: int, token: dict = Depends(verify_token)):
-    db = get_db()
+@router.delete("/api/properties/{property_id}", dependencies=[Depends(invalidates_lists)])
+def delete_property(property_id: int, token: dict = Depends(verify_token), db: Any = Depends(get_db)):
     cursor = db.cursor(as_dict=True)
-    cursor.execute("SELECT * FROM properties WHERE id=%s", (property_id,))
+    cursor.execute("SELECT id FROM properties WHERE id=%s", (property_id,))
     prop = cursor.fetchone()
     if not prop:
         raise HTTPException(404, "Property not found")
@@ -1220,8 +1527,18 @@ async def delete_property(property_id: int, token: dict = Depends(verify_token))
         db.rollback()
         raise HTTPException(500, f"Delete failed: {e}")
     
-@router.post("/api/property-units")
-async def create_property_unit(
+def insert_unit_images(cursor, unit_id: int, names: list):
+    """Insert a unit's image rows in one multi-row INSERT (VALUES caps at 1000 rows)."""
+    for start in range(0, len(names), 1000):
+        batch = names[start:start + 1000]
+        cursor.execute(
+            "INSERT INTO unit_images (unit_id, image_path) VALUES "
+            + ", ".join(["(%s, %s)"] * len(batch)),
+            tuple(v for name in batch for v in (unit_id, name)),
+        )
+
+@router.post("/api/property-units", dependencies=[Depends(invalidates_lists)])
+def create_property_unit(
     propertyId: str = Form(...),
     unitType: str = Form(...),
     unitNumber: str = Form(...),
@@ -1232,47 +1549,43 @@ async def create_property_unit(
     size: float = Form(...),
     description: str = Form(...),
     unitImages: List[UploadFile] = File(...),
-    token: dict = Depends(verify_token)
+    token: dict = Depends(verify_token),
+    db: Any = Depends(get_db),
 ):
-    db = get_db()
     cursor = db.cursor(as_dict=True)
-    cursor.execute("""
-        SELECT id FROM property_units
-        WHERE property_id = %s AND unit_number = %s
-    """, (propertyId, unitNumber))
-    existing_unit = cursor.fetchone()
-    if existing_unit:
-        raise HTTPException(
-            status_code=400,
-            detail=f"Unit '{unitNumber}' already exists for this property."
-        )
-    upload_dir = "uploads/unit-images"
-    os.makedirs(upload_dir, exist_ok=True)
     saved_images = []
     try:
+        # Duplicate check and insert in one statement; the range locks keep a
+        # concurrent request from inserting the same unit number in between
         cursor.execute("""
             INSERT INTO property_units
             (property_id, unit_type, unit_number, commission_percentage,
             rent_price, deposit_price, floor, size, description, status, created_at)
-            VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s, 'vacant', GETDATE())
+            OUTPUT INSERTED.id
+            SELECT %s, %s, %s, %s, %s, %s, %s, %s, %s, 'vacant', GETDATE()
+            WHERE NOT EXISTS (
+                SELECT 1 FROM property_units WITH (UPDLOCK, HOLDLOCK)
+                WHERE property_id = %s AND unit_number = %s
+            )
         """, (
             propertyId, unitType, unitNumber, commissionPercentage,
-            rentPrice, depositPrice, floor, size, description
+            rentPrice, depositPrice, floor, size, description,
+            propertyId, unitNumber
         ))
-        db.commit()
-        cursor.execute("SELECT SCOPE_IDENTITY() AS id")
-        new_unit_id = cursor.fetchone()["id"]
+        row = cursor.fetchone()
+        if row is None:
+            db.rollback()
+            raise HTTPException(
+                status_code=400,
+                detail=f"Unit '{unitNumber}' already exists for this property."
+            )
+        new_unit_id = row["id"]
         for file in unitImages:
             ext = os.path.splitext(file.filename)[-1]
             new_name = f"{uuid4()}{ext}"
-            file_path = os.path.join(upload_dir, new_name)
-            with open(file_path, "wb") as buffer:
-                shutil.copyfileobj(file.file, buffer)
-            cursor.execute("""
-                INSERT INTO unit_images (unit_id, image_path)
-                VALUES (%s, %s)
-            """, (new_unit_id, new_name))
+            copy_upload(file.file, os.path.join(UNIT_IMAGE_DIR, new_name))
             saved_images.append(new_name)
+        insert_unit_images(cursor, new_unit_id, saved_images)
         db.commit()
         return {
             "message": "Property unit created successfully",
@@ -1280,13 +1593,15 @@ async def create_property_unit(
             "images": saved_images
         }
 
+    except HTTPException:
+        raise
     except Exception as e:
         db.rollback()
         print("CreateUnit Error:", str(e))
         raise HTTPException(status_code=400, detail=str(e))
         
-@router.put("/api/property-units/{unit_id}")
-async def update_property_unit(
+@router.put("/api/property-units/{unit_id}", dependencies=[Depends(invalidates_lists)])
+def update_property_unit(
     unit_id: int,
     unitType: str = Form(...),
     unitNumber: str = Form(...),
@@ -1297,74 +1612,70 @@ async def update_property_unit(
     size: float = Form(...),
     description: str = Form(...),
     unitImages: List[UploadFile] = File(None),
-    token: dict = Depends(verify_token)
+    token: dict = Depends(verify_token),
+    db: Any = Depends(get_db),
 ):
-    db = get_db()
     cursor = db.cursor(as_dict=True)
-
-    cursor.execute("SELECT * FROM property_units WHERE id=%s", (unit_id,))
-    unit = cursor.fetchone()
-    if not unit:
-        raise HTTPException(404, "Unit not found")
-    cursor.execute("""
-        SELECT id FROM property_units
-        WHERE property_id=%s AND unit_number=%s AND id != %s
-    """, (unit["property_id"], unitNumber, unit_id))
-    dup = cursor.fetchone()
-    if dup:
-        raise HTTPException(400, "Unit number already exists")
     try:
+        # Duplicate check and update in one statement (see create_property_unit)
         cursor.execute("""
-            UPDATE property_units SET
+            UPDATE pu SET
                 unit_type=%s, unit_number=%s, commission_percentage=%s,
                 rent_price=%s, deposit_price=%s, floor=%s,
                 size=%s, description=%s, updated_at=GETDATE()
-            WHERE id=%s
+            FROM property_units pu
+            WHERE pu.id=%s AND NOT EXISTS (
+                SELECT 1 FROM property_units d WITH (UPDLOCK, HOLDLOCK)
+                WHERE d.property_id=pu.property_id AND d.unit_number=%s AND d.id != pu.id
+            )
         """, (
             unitType, unitNumber, commissionPercentage,
             rentPrice, depositPrice, floor,
-            size, description, unit_id
+            size, description, unit_id, unitNumber
         ))
+        if cursor.rowcount == 0:
+            db.rollback()
+            # Nothing updated: tell a missing unit apart from a duplicate number
+            cursor.execute("SELECT id FROM property_units WHERE id=%s", (unit_id,))
+            if cursor.fetchone() is None:
+                raise HTTPException(404, "Unit not found")
+            raise HTTPException(400, "Unit number already exists")
         db.commit()
         if unitImages:
-            cursor.execute("SELECT * FROM unit_images WHERE unit_id=%s", (unit_id,))
+            cursor.execute("SELECT image_path FROM unit_images WHERE unit_id=%s", (unit_id,))
             old_imgs = cursor.fetchall()
             for img in old_imgs:
-                old_path = f"uploads/unit-images/{img['image_path']}"
+                old_path = os.path.join(UNIT_IMAGE_DIR, img['image_path'])
                 if os.path.exists(old_path):
                     os.remove(old_path)
             cursor.execute("DELETE FROM unit_images WHERE unit_id=%s", (unit_id,))
-            upload_dir = "uploads/unit-images"
-            os.makedirs(upload_dir, exist_ok=True)
+            new_names = []
             for file in unitImages:
                 ext = os.path.splitext(file.filename)[-1]
                 new_name = f"{uuid4()}{ext}"
-                file_path = os.path.join(upload_dir, new_name)
-                with open(file_path, "wb") as f:
-                    shutil.copyfileobj(file.file, f)
-                cursor.execute("""
-                    INSERT INTO unit_images (unit_id, image_path)
-                    VALUES (%s, %s)
-                """, (unit_id, new_name))
+                copy_upload(file.file, os.path.join(UNIT_IMAGE_DIR, new_name))
+                new_names.append(new_name)
+            insert_unit_images(cursor, unit_id, new_names)
             db.commit()
         return {"message": "Unit updated successfully"}
+    except HTTPException:
+        raise
     except Exception as e:
         db.rollback()
         raise HTTPException(500, f"Update failed: {e}")
     
-@router.delete("/api/property-units/{unit_id}")
-async def delete_property_unit(unit_id: int, token: dict = Depends(verify_token)):
-    db = get_db()
+@router.delete("/api/property-units/{unit_id}", dependencies=[Depends(invalidates_lists)])
+def delete_property_unit(unit_id: int, token: dict = Depends(verify_token), db: Any = Depends(get_db)):
     cursor = db.cursor(as_dict=True)
-    cursor.execute("SELECT * FROM property_units WHERE id=%s", (unit_id,))
+    cursor.execute("SELECT id FROM property_units WHERE id=%s", (unit_id,))
     unit = cursor.fetchone()
     if not unit:
         raise HTTPException(404, "Unit not found")
     try:
-        cursor.execute("SELECT * FROM unit_images WHERE unit_id=%s", (unit_id,))
+        cursor.execute("SELECT image_path FROM unit_images WHERE unit_id=%s", (unit_id,))
         imgs = cursor.fetchall()
         for img in imgs:
-            path = f"uploads/unit-images/{img['image_path']}"
+            path = os.path.join(UNIT_IMAGE_DIR, img['image_path'])
             if os.path.exists(path):
                 os.remove(path)
         cursor.execute("DELETE FROM unit_images WHERE unit_id=%s", (unit_id,))
@@ -1374,10 +1685,8 @@ async def delete_property_unit(unit_id: int, token: dict = Depends(verify_token)
     except Exception as e:
         db.rollback()
         raise HTTPException(500, f"Delete failed: {e}")
-UPLOAD_DIR = "uploads/leases"
-os.makedirs(UPLOAD_DIR, exist_ok=True)
 
-@router.post("/api/leases")
+@router.post("/api/leases", dependencies=[Depends(invalidates_lists)])
 async def create_lease(
     property: int = Form(...),
     leaseUnits: bool = Form(False),
@@ -1399,135 +1708,145 @@ async def create_lease(
     bills_taxAmount: Optional[float] = Form(None),
     leaseDocuments: List[UploadFile] = File([]),
     token: dict = Depends(verify_token),
+    db: Any = Depends(get_db),
 ):
-    db = get_db()
     cursor = db.cursor()
     saved_files = []
+    saves = []
     for doc in leaseDocuments:
         filename = f"{uuid.uuid4()}-{doc.filename}"
-        filepath = os.path.join(UPLOAD_DIR, filename)
-        with open(filepath, "wb") as buffer:
-            shutil.copyfileobj(doc.file, buffer)
-        saved_files.append(f"/{UPLOAD_DIR}/{filename}")
-    query = """
-    INSERT INTO leases (
-        property_id, property_unit_id, tenant_id,
-        rent_price, deposit_price, start_date, end_date,
-        tenancy_terms, lease_documents,
-        bill_gas, bill_gas_amount,
-        bill_electricity, bill_electricity_amount,
-        bill_internet, bill_internet_amount,
-        bill_tax, bill_tax_amount
-    )
-    VALUES (
-        %(property_id)s, %(unit)s, %(tenant_id)s,
-        %(rent_price)s, %(deposit_price)s, %(start_date)s, %(end_date)s,
-        %(tenancy_terms)s, %(lease_documents)s,
-        %(bill_gas)s, %(bill_gas_amount)s,
-        %(bill_electricity)s, %(bill_electricity_amount)s,
-        %(bill_internet)s, %(bill_internet_amount)s,
-        %(bill_tax)s, %(bill_tax_amount)s
-    )
-    """
-    params = {
-        "property_id": property,
-        "unit": unit,
-        "tenant_id": tenant,
-        "rent_price": rentPrice,
-        "deposit_price": depositPrice,
-        "start_date": startDate,
-        "end_date": endDate,
-        "tenancy_terms": tenancyTerms,
-        "lease_documents": ",".join(saved_files),
-        "bill_gas": bills_gas,
-        "bill_gas_amount": bills_gasAmount,
-        "bill_electricity": bills_electricity,
-        "bill_electricity_amount": bills_electricityAmount,
-        "bill_internet": bills_internet,
-        "bill_internet_amount": bills_internetAmount,
-        "bill_tax": bills_tax,
-        "bill_tax_amount": bills_taxAmount,
-    }
-    try:
-        cursor.execute(query, params)
-        db.commit()
-        
-        # Get the newly created lease ID
-        cursor.execute("SELECT @@IDENTITY AS id")
-        lease_id = cursor.fetchone()[0]
+        saves.append(save_upload(doc, os.path.join(LEASE_DIR, filename)))
+        saved_files.append(f"/uploads/leases/{filename}")
+    await asyncio.gather(*saves)
+
+    # pymssql blocks: run the DB work in the threadpool, off the event loop
+    def write():
+        query = """
+        INSERT INTO leases (
+            property_id, property_unit_id, tenant_id,
+            rent_price, deposit_price, start_date, end_date,
+            tenancy_terms, lease_documents,
+            bill_gas, bill_gas_amount,
+            bill_electricity, bill_electricity_amount,
+            bill_internet, bill_internet_amount,
+            bill_tax, bill_tax_amount
+        )
+        OUTPUT INSERTED.id
+        VALUES (
+            %(property_id)s, %(unit)s, %(tenant_id)s,
+            %(rent_price)s, %(deposit_price)s, %(start_date)s, %(end_date)s,
+            %(tenancy_terms)s, %(lease_documents)s,
+            %(bill_gas)s, %(bill_gas_amount)s,
+            %(bill_electricity)s, %(bill_electricity_amount)s,
+            %(bill_internet)s, %(bill_internet_amount)s,
+            %(bill_tax)s, %(bill_tax_amount)s
+        )
+        """
+        params = {
+            "property_id": property,
+            "unit": unit,
+            "tenant_id": tenant,
+            "rent_price": rentPrice,
+            "deposit_price": depositPrice,
+            "start_date": startDate,
+            "end_date": endDate,
+            "tenancy_terms": tenancyTerms,
+            "lease_documents": ",".join(saved_files),
+            "bill_gas": bills_gas,
+            "bill_gas_amount": bills_gasAmount,
+            "bill_electricity": bills_electricity,
+            "bill_electricity_amount": bills_electricityAmount,
+            "bill_internet": bills_internet,
+            "bill_internet_amount": bills_internetAmount,
+            "bill_tax": bills_tax,
+            "bill_tax_amount": bills_taxAmount,
+        }
+        try:
+            cursor.execute(query, params)
+            lease_id = cursor.fetchone()[0]
+            db.commit()
         
-        # Auto-generate invoice for the lease (if SQLAlchemy is available)
-        invoice_created = False
-        invoice_id = None
-        invoice_amount = None
-        invoice_due_date = None
+            # Auto-generate invoice for the lease (if SQLAlchemy is available)
+            invoice_created = False
+            invoice_id = None
+            invoice_amount = None
+            invoice_due_date = None
         
-        try:
-            from datetime import datetime
-            from decimal import Decimal
-            from database import get_session_context
-            from services import InvoiceService
+            try:
+                from datetime import datetime
+                from decimal import Decimal
+                from database import get_session_context
+                from services import InvoiceService
             
-            # Parse start date
-            lease_start = datetime.strptime(startDate, "%Y-%m-%d").date()
+                # Parse start date
+                lease_start = datetime.strptime(startDate, "%Y-%m-%d").date()
             
-            # Create invoice using the service layer
-            with get_session_context() as sqlalchemy_db:
-                invoice = InvoiceService.create_initial_lease_invoice(
-                    db=sqlalchemy_db,
-                    lease_id=lease_id,
-                    tenant_id=tenant,
-                    rent_price=Decimal(str(rentPrice)),
-                    start_date=lease_start
-                )
-                invoice_created = True
-                invoice_id = invoice.id
-                invoice_amount = float(invoice.amount)
-                invoice_due_date = invoice.due_date.isoformat()
+                # Create invoice using the service layer
+                with get_session_context() as sqlalchemy_db:
+                    invoice = InvoiceService.create_initial_lease_invoice(
+                        db=sqlalchemy_db,
+                        lease_id=lease_id,
+                        tenant_id=tenant,
+                        rent_price=Decimal(str(rentPrice)),
+                        start_date=lease_start
+                    )
+                    invoice_created = True
+                    invoice_id = invoice.id
+                    invoice_amount = float(invoice.amount)
+                    invoice_due_date = invoice.due_date.isoformat()
                 
-            print(f"✅ Auto-generated invoice #{invoice_id} for lease #{lease_id}")
+                print(f"✅ Auto-generated invoice #{invoice_id} for lease #{lease_id}")
             
-        except Exception as invoice_error:
-            # If invoice creation fails, log but don't fail the lease creation
-            print(f"Failed to auto-generate invoice: {invoice_error}")
-            # Lease was still created successfully
+            except Exception as invoice_error:
+                # If invoice creation fails, log but don't fail the lease creation
+                print(f"Failed to auto-generate invoice: {invoice_error}")
+                # Lease was still created successfully
         
-        # Return response (backward compatible)
-        response = {"message": "Lease created successfully"}
+            # Return response (backward compatible)
+            response = {"message": "Lease created successfully"}
         
-        # Add invoice info if it was created (non-breaking addition)
-        if invoice_created:
-            response["invoice_created"] = True
-            response["invoice"] = {
-                "id": invoice_id,
-                "amount": invoice_amount,
-                "due_date": invoice_due_date,
-                "status": "PENDING"
-            }
+            # Add invoice info if it was created (non-breaking addition)
+            if invoice_created:
+                response["invoice_created"] = True
+                response["invoice"] = {
+                    "id": invoice_id,
+                    "amount": invoice_amount,
+                    "due_date": invoice_due_date,
+                    "status": "PENDING"
+                }
         
-        return response
+            return response
         
-    except Exception as e:
-        db.rollback()
-        return {"error": str(e)}
+        except Exception as e:
+            db.rollback()
+            return {"error": str(e)}
+
+    return await anyio.to_thread.run_sync(write)
     
 @app.get("/api/tenants")
-def get_all_tenants(token: dict = Depends(verify_token)):
+def get_all_tenants(
+    page: int = Query(1, ge=1, description="Page number"),
+    page_size: int = Query(50, ge=1, le=100, description="Items per page"),
+    token: dict = Depends(verify_token),
+):
     try:
-        db = get_db()
-        cursor = db.cursor(as_dict=True)
-        cursor.execute("SELECT * FROM tenants")
-        return cursor.fetchall()
+        return cached_list(("tenants", page, page_size), """
+            SELECT tenant_id, user_id, first_name, last_name, email,
+                   contact_number, city, status, created_at
+            FROM tenants
+            ORDER BY tenant_id
+            OFFSET @p1 ROWS FETCH NEXT @p2 ROWS ONLY
+        """, "@p1 int, @p2 int", ((page - 1) * page_size, page_size))
+    except HTTPException:
+        raise
     except Exception as e:
         print("/api/tenants error:", str(e))
         raise HTTPException(status_code=500, detail="Database error: " + str(e))
     
 @app.get("/api/tenantdetails/{tenant_id}")
 def get_tenant_by_id(tenant_id: int, token: dict = Depends(verify_token)):
-    db = get_db()
-    cursor = db.cursor(as_dict=True)
     try:
-        cursor.execute("""
+        rows = cached_list(("tenant", tenant_id), """
             SELECT
                 t.tenant_id,
                 t.last_name, 
@@ -1550,11 +1869,12 @@ def get_tenant_by_id(tenant_id: int, token: dict = Depends(verify_token)):
                 t.status,
                 t.admin_comment
             FROM tenants t
-            WHERE t.tenant_id = %s
-        """, (tenant_id,))
-        result = cursor.fetchone()
-        if not result:
+            WHERE t.tenant_id = @p1
+        """, "@p1 int", (tenant_id,))
+        if not rows:
             raise HTTPException(status_code=404, detail="Tenant not found")
+        # Copy: the cached row is shared across requests
+        result = dict(rows[0])
         result["id_documents"] = (
             [{
                 "file_url": result["id_document_url"],
@@ -1565,23 +1885,30 @@ def get_tenant_by_id(tenant_id: int, token: dict = Depends(verify_token)):
             else []
         )
         return result
+    except HTTPException:
+        raise
     except Exception as e:
         print("Error fetching tenant by ID:", str(e))
         raise HTTPException(status_code=500, detail=str(e))
 
 @app.get("/api/property-owners")
-def get_all_property_owners(token: dict = Depends(verify_token)):
-    db = get_db()
-    cursor = db.cursor(as_dict=True)
-    cursor.execute("SELECT * FROM property_owners")
-    return cursor.fetchall()
+def get_all_property_owners(
+    page: int = Query(1, ge=1, description="Page number"),
+    page_size: int = Query(50, ge=1, le=100, description="Items per page"),
+    token: dict = Depends(verify_token),
+):
+    return cached_list(("property-owners", page, page_size), """
+        SELECT owner_id, user_id, first_name, last_name, email,
+               contact_number, city, status, created_at
+        FROM property_owners
+        ORDER BY owner_id
+        OFFSET @p1 ROWS FETCH NEXT @p2 ROWS ONLY
+    """, "@p1 int, @p2 int", ((page - 1) * page_size, page_size))
 
 @app.get("/api/ownerdetails/{owner_id}")
 def get_owner_by_id(owner_id: int, token: dict = Depends(verify_token)):
-    db = get_db()
-    cursor = db.cursor(as_dict=True)
     try:
-        cursor.execute("""
+        rows = cached_list(("owner", owner_id), """
             SELECT
                 po.owner_id,
                 po.last_name, 
@@ -1602,11 +1929,12 @@ def get_owner_by_id(owner_id: int, token: dict = Depends(verify_token)):
                 po.status,
                 po.admin_comment
             FROM property_owners po
-            WHERE po.owner_id = %s
-        """, (owner_id,))
-        result = cursor.fetchone()
-        if not result:
+            WHERE po.owner_id = @p1
+        """, "@p1 int", (owner_id,))
+        if not rows:
             raise HTTPException(status_code=404, detail="Owner not found")
+        # Copy: the cached row is shared across requests
+        result = dict(rows[0])
         result["id_documents"] = (
             [{
                 "file_url": result["id_document_url"],
@@ -1617,71 +1945,132 @@ def get_owner_by_id(owner_id: int, token: dict = Depends(verify_token)):
             else []
         )
         return result
+    except HTTPException:
+        raise
     except Exception as e:
         print("Error fetching owner by ID:", str(e))
         raise HTTPException(status_code=500, detail=str(e))
 
 @app.get("/api/properties")
-def get_all_properties(token: dict = Depends(verify_token)):
-    db = get_db()
-    cursor = db.cursor(as_dict=True)
-    cursor.execute("""
+def get_all_properties(
+    page: int = Query(1, ge=1, description="Page number"),
+    page_size: int = Query(50, ge=1, le=100, description="Items per page"),
+    token: dict = Depends(verify_token),
+):
+    return cached_list(("properties", page, page_size), """
     SELECT 
-        p.*,
+        p.id,
+        p.property_name,
+        p.registered_owner,
+        p.area_measurement,
+        p.street,
+        p.barangay,
+        p.city,
+        p.province,
+        p.units,
+        p.selected_features,
+        p.created_at,
         CONCAT(po.first_name, ' ', po.last_name) AS owner_full_name
     FROM properties p
     LEFT JOIN property_owners po 
-        ON p.registered_owner = po.owner_id;""")
-    return cursor.fetchall()
+        ON p.registered_owner = po.owner_id
+    ORDER BY p.id
+    OFFSET @p1 ROWS FETCH NEXT @p2 ROWS ONLY;""", "@p1 int, @p2 int", ((page - 1) * page_size, page_size))
 
 @app.get("/api/property-units")
-def get_property_units(token: dict = Depends(verify_token)):
-    db = get_db()
-    cursor = db.cursor(as_dict=True)
-    cursor.execute("""
-        SELECT pu.*, p.property_name
+def get_property_units(
+    page: int = Query(1, ge=1, description="Page number"),
+    page_size: int = Query(50, ge=1, le=100, description="Items per page"),
+    layout: ListLayout = LAYOUT_QUERY,
+    token: dict = Depends(verify_token),
+):
+    columnar = layout == "columns"
+    data = cached_list(("property-units", page, page_size), """
+        SELECT pu.id, pu.property_id, pu.unit_number, pu.unit_type,
+               pu.rent_price, pu.deposit_price, pu.floor, pu.size,
+               pu.status, pu.created_at, p.property_name
         FROM property_units pu
         JOIN properties p ON pu.property_id = p.id
-    """)
-    return cursor.fetchall()
+        ORDER BY pu.id
+        OFFSET @p1 ROWS FETCH NEXT @p2 ROWS ONLY
+    """, "@p1 int, @p2 int", ((page - 1) * page_size, page_size), columnar=columnar)
+    return columnar_response(data) if columnar else data
 
 @app.get("/api/property-units/vacant")
 def get_vacant_property_units(token: dict = Depends(verify_token)):
     try:
-        db = get_db()
-        cursor = db.cursor(as_dict=True)
-        cursor.execute("""
-            SELECT pu.*, p.property_name
+        return cached_list(("vacant-units",), """
+            SELECT pu.id, pu.property_id, pu.unit_number, pu.unit_type,
+                   pu.rent_price, pu.status, p.property_name
             FROM property_units pu
             JOIN properties p ON pu.property_id = p.id
             WHERE pu.status = 'vacant'
-        """)
-        return cursor.fetchall()
-
+        """, "", ())
+    except HTTPException:
+        raise
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
 
 @app.get("/api/leases")
-def get_all_leases(token: dict = Depends(verify_token)):
-    db = get_db()
-    cursor = db.cursor(as_dict=True)
-    cursor.execute("""
-        SELECT lt.*, p.property_name, pu.unit_number, pu.unit_type, t.email
+def get_all_leases(
+    before: Optional[datetime] = Query(None, description="next_before from the previous page; requires before_id"),
+    before_id: Optional[int] = Query(None, description="next_before_id from the previous page; requires before"),
+    limit: int = Query(50, ge=1, le=100, description="Items per page"),
+    layout: ListLayout = LAYOUT_QUERY,
+    token: dict = Depends(verify_token),
+):
+    columnar = layout == "columns"
+    # Keyset pagination: seek past (before, before_id) on ix_leases_created_at
+    # instead of sorting the whole table. First page and later pages are two
+    # fixed statements so each keeps its own cached plan.
+    params, param_decl, where = keyset_filter("lt", before, before_id, limit)
+    data = cached_list(("leases", before, before_id, limit), f"""
+        SELECT
+            lt.id, lt.property_id, lt.property_unit_id, lt.tenant_id,
+            lt.rent_price, lt.deposit_price, lt.start_date, lt.end_date,
+            lt.lease_documents,
+            lt.bill_gas, lt.bill_gas_amount,
+            lt.bill_electricity, lt.bill_electricity_amount,
+            lt.bill_internet, lt.bill_internet_amount,
+            lt.bill_tax, lt.bill_tax_amount,
+            lt.created_at,
+            p.property_name, pu.unit_number, pu.unit_type, t.email
         FROM leases lt
         LEFT JOIN properties p ON lt.property_id = p.property_id
         LEFT JOIN property_units pu ON lt.property_unit_id = pu.property_unit_id
         LEFT JOIN tenants t ON lt.tenant_id = t.tenant_id
-        ORDER BY lt.created_at DESC
-    """)
-    return cursor.fetchall()
+        {where}
+        ORDER BY lt.created_at DESC, lt.id DESC
+        OFFSET 0 ROWS FETCH NEXT @p1 ROWS ONLY
+    """, param_decl, params, columnar=columnar)
+    if columnar:
+        return columnar_response({**data, **next_cursor(data["rows"], limit, "id", data["columns"])})
+    # The rows layout stays a bare list for existing clients, so its cursor
+    # goes in headers instead
+    page = next_cursor(data, limit, "id")
+    headers = {}
+    if page["next_before"] is not None:
+        headers = {
+            "X-Next-Before": page["next_before"].isoformat(),
+            "X-Next-Before-Id": str(page["next_before_id"]),
+        }
+    return ORJSONResponse(data, headers=headers)
 
 @app.get("/api/maintenance-requests")
-def get_maintenance_requests(token: dict = Depends(verify_token)):
-    db = get_db()
-    cursor = db.cursor(as_dict=True)
+def get_maintenance_requests(
+    before: Optional[datetime] = Query(None, description="next_before from the previous page; requires before_id"),
+    before_id: Optional[int] = Query(None, description="next_before_id from the previous page; requires before"),
+    limit: int = Query(50, ge=1, le=100, description="Items per page"),
+    layout: ListLayout = LAYOUT_QUERY,
+    token: dict = Depends(verify_token),
+    db: Any = Depends(get_db),
+):
+    columnar = layout == "columns"
+    cursor = db.cursor(as_dict=not columnar)
+    params, param_decl, where = keyset_filter("mr", before, before_id, limit)
     try:
-        cursor.execute("""
+        execute_prepared(cursor, f"""
             SELECT 
                 mr.id AS maintenance_request_id,
                 mr.tenant_id,
@@ -1695,19 +2084,29 @@ def get_maintenance_requests(token: dict = Depends(verify_token)):
                 mr.updated_at
             FROM maintenance_requests mr
             JOIN users u ON u.id = mr.tenant_id
-            ORDER BY mr.created_at DESC
-        """)
-        return {"requests": cursor.fetchall()}
+            {where}
+            ORDER BY mr.created_at DESC, mr.id DESC
+            OFFSET 0 ROWS FETCH NEXT @p1 ROWS ONLY
+        """, param_decl, params)
+        if columnar:
+            columns = [c[0] for c in cursor.description]
+            rows = cursor.fetchall()
+            return columnar_response({
+                "columns": columns,
+                "rows": rows,
+                **next_cursor(rows, limit, "maintenance_request_id", columns),
+            })
+        rows = cursor.fetchall()
+        return {"requests": rows, **next_cursor(rows, limit, "maintenance_request_id")}
     except Exception as e:
         print("Error fetching maintenance requests:", str(e))
         raise HTTPException(status_code=500, detail="Failed to fetch maintenance requests")
     
 @app.get("/api/maintenance-requests/{request_id}")
-def get_maintenance_request_by_id(request_id: int, token: dict = Depends(verify_token)):
-    db = get_db()
+def get_maintenance_request_by_id(request_id: int, token: dict = Depends(verify_token), db: Any = Depends(get_db)):
     cursor = db.cursor(as_dict=True)
     try:
-        cursor.execute("""
+        execute_prepared(cursor, """
             SELECT 
                 mr.id AS maintenance_request_id,
                 mr.tenant_id,
@@ -1720,36 +2119,29 @@ def get_maintenance_request_by_id(request_id: int, token: dict = Depends(verify_
                 mr.scheduled_at,
                 mr.admin_comment,
                 mr.created_at,
-                mr.updated_at
+                mr.updated_at,
+                ma.id AS attachment_id,
+                ma.file_url,
+                ma.file_type,
+                ma.uploaded_at
             FROM maintenance_requests mr
             JOIN users u ON u.id = mr.tenant_id
-            WHERE mr.id = %s
-        """, (request_id,))
-        result = cursor.fetchone()
-        if not result:
+            LEFT JOIN maintenance_attachments ma ON ma.request_id = mr.id
+            WHERE mr.id = @p1
+        """, "@p1 int", (request_id,))
+        rows = cursor.fetchall()
+        if not rows:
             raise HTTPException(status_code=404, detail="Maintenance request not found")
-        cursor.execute("""
-            SELECT 
-                id AS attachment_id,
-                file_url,
-                file_type,
-                uploaded_at
-            FROM maintenance_attachments
-            WHERE request_id = %s
-        """, (request_id,))
-        attachments = cursor.fetchall()
-        result["attachments"] = attachments
-        return result
+        return fold_attachments(rows)
     except Exception as e:
         print("Error fetching request by ID:", str(e))
         raise HTTPException(status_code=500, detail="Failed to fetch maintenance request")
     
 @app.get("/api/maintenance-ongoing/{request_id}")
-def get_ongoing_maintenance_request_by_id(request_id: int, token: dict = Depends(verify_token)):
-    db = get_db()
+def get_ongoing_maintenance_request_by_id(request_id: int, token: dict = Depends(verify_token), db: Any = Depends(get_db)):
     cursor = db.cursor(as_dict=True)
     try:
-        cursor.execute("""
+        execute_prepared(cursor, """
             SELECT 
                 mr.id AS maintenance_request_id,
                 mr.tenant_id,
@@ -1762,27 +2154,20 @@ def get_ongoing_maintenance_request_by_id(request_id: int, token: dict = Depends
                 mr.scheduled_at,
                 mr.admin_comment,
                 mr.created_at,
-                mr.updated_at
+                mr.updated_at,
+                ma.id AS attachment_id,
+                ma.file_url,
+                ma.file_type,
+                ma.uploaded_at
             FROM maintenance_requests mr
             JOIN users u ON u.id = mr.tenant_id
-            WHERE mr.id = %s
-        """, (request_id,))
-        result = cursor.fetchone()
-        
-        if not result:
+            LEFT JOIN maintenance_attachments ma ON ma.request_id = mr.id
+            WHERE mr.id = @p1
+        """, "@p1 int", (request_id,))
+        rows = cursor.fetchall()
+        if not rows:
             raise HTTPException(status_code=404, detail="Maintenance request not found")
-        cursor.execute("""
-            SELECT 
-                id AS attachment_id,
-                file_url,
-                file_type,
-                uploaded_at
-            FROM maintenance_attachments
-            WHERE request_id = %s
-        """, (request_id,))
-        attachments = cursor.fetchall()
-        result["attachments"] = attachments
-        return result
+        return fold_attachments(rows)
 
     except Exception as e:
         print("Error fetching request by ID:", str(e))
@@ -1797,48 +2182,67 @@ async def submit_maintenance_request(
     files: Optional[List[UploadFile]] = File(None),
     scheduled_at: Optional[str] = Form(None),
     token: dict = Depends(verify_token),
+    db: Any = Depends(get_db),
 ):
     tenant_id = token.get("id")
-    db = get_db()
-    cursor = db.cursor()
+    total = 0
+    for upload in files or []:
+        check_upload_size(upload, MAX_UPLOAD_BYTES)
+        total += upload.size or 0
+    if total > MAX_UPLOAD_BYTES:
+        raise HTTPException(status_code=413, detail="Upload too large")
+    saved_files = []
+    attachments = []
     try:
         scheduled_dt = None
         if scheduled_at:
             scheduled_dt = datetime.fromisoformat(scheduled_at.replace("Z", ""))
-        cursor.execute("""
-            INSERT INTO maintenance_requests (
-                tenant_id, maintenance_type, category, description, status, scheduled_at, created_at, updated_at
-            ) VALUES (%s, %s, %s, %s, %s, %s, GETDATE(), GETDATE())
-        """, (tenant_id, maintenance_type, category, description, "pending", scheduled_dt))
-        db.commit()
-        cursor.execute("SELECT SCOPE_IDENTITY()")
-        request_id = cursor.fetchone()[0]
-        saved_files = []
-        if files:
-            for upload in files:
-                filename = f"{uuid.uuid4()}_{upload.filename.replace(' ', '_')}"
-                file_path = os.path.join(UPLOAD_DIR, filename)
-                with open(file_path, "wb") as buffer:
-                    shutil.copyfileobj(upload.file, buffer)
-                cursor.execute("""
-                    INSERT INTO maintenance_attachments (request_id, file_url, file_type, uploaded_at)
-                    VALUES (%s, %s, %s, GETDATE())
-                """, (request_id, f"/uploads/{filename}", upload.content_type))
-                saved_files.append(filename)
-        db.commit()
-        return {
-            "success": True,
-            "message": "Maintenance request submitted",
-            "request_id": request_id,
-            "attachments": saved_files
-        }
+        saves = []
+        for upload in files or []:
+            filename = secrets.token_hex(16) + os.path.splitext(upload.filename or "")[1].lower()
+            saves.append(save_upload(upload, os.path.join(UPLOAD_DIR, filename)))
+            attachments.append((f"/uploads/{filename}", upload.content_type))
+            saved_files.append(filename)
+        # Each save runs in its own threadpool thread; write them in parallel
+        await asyncio.gather(*saves)
     except Exception as e:
         print("Maintenance request error:", str(e))
         raise HTTPException(status_code=500, detail="Failed to submit maintenance request")
+
+    # pymssql blocks: run the DB work in the threadpool, off the event loop
+    def write():
+        cursor = db.cursor()
+        try:
+            cursor.execute("""
+                INSERT INTO maintenance_requests (
+                    tenant_id, maintenance_type, category, description, status, scheduled_at, created_at, updated_at
+                ) OUTPUT INSERTED.id
+                VALUES (%s, %s, %s, %s, %s, %s, GETDATE(), GETDATE())
+            """, (tenant_id, maintenance_type, category, description, "pending", scheduled_dt))
+            request_id = cursor.fetchone()[0]
+            if attachments:
+                # One multi-row INSERT: pymssql's executemany is still one
+                # round-trip per row
+                cursor.execute(
+                    "INSERT INTO maintenance_attachments (request_id, file_url, file_type, uploaded_at) VALUES "
+                    + ", ".join(["(%s, %s, %s, GETDATE())"] * len(attachments)),
+                    tuple(v for url, file_type in attachments for v in (request_id, url, file_type)),
+                )
+            db.commit()
+            return {
+                "success": True,
+                "message": "Maintenance request submitted",
+                "request_id": request_id,
+                "attachments": saved_files
+            }
+        except Exception as e:
+            print("Maintenance request error:", str(e))
+            raise HTTPException(status_code=500, detail="Failed to submit maintenance request")
+
+    return await anyio.to_thread.run_sync(write)
     
 @app.get("/api/announcements")
-async def get_announcements():
-    conn = get_db()
+def get_announcements(conn: Any = Depends(get_db)):
     cursor = conn.cursor(as_dict=True)
     cursor.execute("""
         SELECT id, title, description, file_url, created_at
@@ -1867,16 +2271,32 @@ except Exception as e:
     print("   Ensure routers/webhooks.py and routers/checkout.py exist")
 
 # 404 Fallback Middleware
-@app.middleware("http")
-async def not_found_middleware(request: Request, call_next):
-    try:
-        response = await call_next(request)
-        if response.status_code == 404:
-            return JSONResponse(status_code=404, content={"error": "Route not found"})
-        return response
-    except Exception:
-        return JSONResponse(status_code=500, content={"error": "Internal server error, Please try again."})
+# Exception handlers instead of a wrapping middleware: no extra ASGI layer on
+# every request, and Starlette still logs the traceback for unhandled errors.
+@app.exception_handler(404)
+async def not_found_handler(request: Request, exc: StarletteHTTPException):
+    if exc.detail == "Not Found":  # Starlette's default: no route matched
+        return JSONResponse(status_code=404, content={"error": "Route not found"})
+    return JSONResponse(status_code=404, content={"detail": exc.detail})
+
+@app.exception_handler(Exception)
+async def internal_error_handler(request: Request, exc: Exception):
+    return JSONResponse(status_code=500, content={"error": "Internal server error, Please try again."})
 
 if __name__ == "__main__":
     port = int(os.getenv("PORT", 10000))
-    uvicorn.run("main:app", host="0.0.0.0", port=port, reload=True)
+    dev = os.getenv("DEV") == "1"
+    workers = 1 if dev else int(os.getenv("WEB_CONCURRENCY", os.cpu_count() or 1))
+    # Worker processes inherit this; database and utils.passwords split
+    # their per-process pools by it
+    os.environ["WEB_CONCURRENCY"] = str(workers)
+    uvicorn.run(
+        "main:app",
+        host="0.0.0.0",
+        port=port,
+        # reload and workers are mutually exclusive in uvicorn
+        workers=None if dev else workers,
+        loop="auto",  # uvloop / httptools when installed
+        http="auto",
+        reload=dev,
+    )
@@ -0,0 +1,59 @@
+"""
+Helpers for Alembic data migrations.
+
+Alembic loads ``alembic/env.py`` as a throwaway module, so anything a
+revision script needs to import lives here instead (the project root is on
+``sys.path`` via ``prepend_sys_path`` in alembic.ini).
+
+Usage (inside a revision's upgrade()):
+    from migration_helpers import paginated_migrate
+
+    invoices = sa.table("invoices", sa.column("id"), sa.column("amount"))
+
+    def fix_page(connection, rows):
+        connection.execute(...)
+
+    paginated_migrate(invoices, fix_page, page_size=100)
+"""
+from typing import Callable, Sequence
+
+import sqlalchemy as sa
+from alembic import context, op
+from sqlalchemy.engine import Connection, Row
+
+
+def paginated_migrate(
+    table: sa.TableClause,
+    process_page: Callable[[Connection, Sequence[Row]], None],
+    page_size: int = 100,
+    key: str = "id",
+) -> int:
+    """
+    Walk ``table`` in keyset pages of ``page_size`` rows ordered by ``key``
+    and hand each page to ``process_page``.
+
+    Runs inside ``context.autocommit_block()`` so every page is committed on
+    its own: the working set stays bounded and SQL Server never has to hold
+    the whole backfill in a single transaction log. Online mode only.
+
+    Returns:
+        Number of rows processed
+    """
+    key_col = table.c[key]
+    last_key = None
+    processed = 0
+
+    with context.autocommit_block():
+        connection = op.get_bind().execution_options(yield_per=page_size)
+        while True:
+            query = sa.select(table).order_by(key_col).limit(page_size)
+            if last_key is not None:
+                query = query.where(key_col > last_key)
+            rows = connection.execute(query).fetchall()
+            if not rows:
+                break
+            process_page(connection, rows)
+            processed += len(rows)
+            last_key = rows[-1]._mapping[key]
+
+    return processed
@@ -1,6 +1,7 @@
 # models/invoice.py
 import enum
-from sqlalchemy import Column, Integer, Numeric, Date, DateTime, ForeignKey, Enum, func
+from sqlalchemy import CheckConstraint, Column, Integer, Numeric, Date, DateTime, ForeignKey, Index, SmallInteger, func, text
+from sqlalchemy.types import TypeDecorator
 from sqlalchemy.orm import relationship
 from .base import Base
 
@@ -12,6 +13,34 @@ class InvoiceStatus(str, enum.Enum):
     OVERDUE = "OVERDUE"
 
 
+class InvoiceStatusCode(enum.IntEnum):
+    """Compact on-disk codes for InvoiceStatus (stored as SMALLINT)."""
+    PENDING = 0
+    PAID = 1
+    OVERDUE = 2
+
+
+class InvoiceStatusType(TypeDecorator):
+    """
+    Maps InvoiceStatus to its SMALLINT code in the database.
+    
+    Application code and the API keep using the string enum; only the
+    storage (and the status index keys) are the 2-byte integer code.
+    """
+    impl = SmallInteger
+    cache_ok = True
+
+    def process_bind_param(self, value, dialect):
+        if value is None:
+            return None
+        return InvoiceStatusCode[InvoiceStatus(value).name].value
+
+    def process_result_value(self, value, dialect):
+        if value is None:
+            return None
+        return InvoiceStatus[InvoiceStatusCode(value).name]
+
+
 class Invoice(Base):
     """
     Invoice model - billing records for tenants based on their leases.
@@ -20,6 +49,28 @@ class Invoice(Base):
     associated with a tenant's lease agreement.
     """
     __tablename__ = "invoices"
+    __table_args__ = (
+        CheckConstraint("status IN (0, 1, 2)", name="ck_invoices_status"),
+        # Covers tenant/status list queries ordered by due_date DESC
+        Index(
+            "ix_invoices_tenant_status_duedate",
+            "tenant_id", "status", text("due_date DESC"),
+            mssql_include=["amount"],
+        ),
+        # Filtered index for open balances / overdue lookups per tenant
+        Index(
+            "ix_invoices_pending",
+            "tenant_id", "due_date",
+            mssql_where=text("status = 0"),
+            mssql_include=["amount"],
+        ),
+        # Nightly overdue sweep: PENDING invoices with due_date < today
+        Index(
+            "ix_invoices_pending_due",
+            "due_date",
+            mssql_where=text("status = 0"),
+        ),
+    )
 
     id = Column(Integer, primary_key=True, autoincrement=True)
     
@@ -27,8 +78,7 @@ class Invoice(Base):
     tenant_id = Column(
         Integer, 
         ForeignKey("tenants.tenant_id", ondelete="CASCADE"), 
-        nullable=False,
-        index=True
+        nullable=False
     )
     lease_id = Column(
         Integer, 
@@ -41,10 +91,10 @@ class Invoice(Base):
     amount = Column(Numeric(12, 2), nullable=False)
     due_date = Column(Date, nullable=False, index=True)
     status = Column(
-        Enum(InvoiceStatus, name="invoice_status", create_constraint=True),
+        InvoiceStatusType(),
         default=InvoiceStatus.PENDING,
-        nullable=False,
-        index=True
+        server_default="0",
+        nullable=False
     )
     
     # Timestamps
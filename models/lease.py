@@ -1,5 +1,5 @@
 # models/lease.py
-from sqlalchemy import Column, Integer, String, Numeric, Date, Boolean, Text, DateTime, ForeignKey, func
+from sqlalchemy import Column, Integer, String, Numeric, Date, Boolean, Text, DateTime, ForeignKey, Index, func, text
 from sqlalchemy.orm import relationship
 from .base import Base
 
@@ -10,6 +10,14 @@ class Lease(Base):
     Maps to existing 'leases' table in the database.
     """
     __tablename__ = "leases"
+    __table_args__ = (
+        # Newest-first listing; keyset pagination seeks on (created_at, id)
+        Index(
+            "ix_leases_created_at",
+            text("created_at DESC"), text("id DESC"),
+            mssql_include=["property_id", "property_unit_id", "tenant_id"],
+        ),
+    )
 
     id = Column(Integer, primary_key=True, autoincrement=True)
     property_id = Column(Integer, ForeignKey("properties.id"), nullable=False)
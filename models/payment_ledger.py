@@ -3,10 +3,11 @@
 PaymentLedger model - blockchain-like immutable record of confirmed payments.
 
 Each record stores a SHA-256 hash of (invoice_id + tenant_id + amount + timestamp)
-and a reference to the previous record's hash, forming a chain.
+and a reference to the previous record's hash, forming a chain. Hashes are stored
+as raw 32-byte digests (BINARY(32)); use ``.hex()`` when exposing them.
 Records are append-only; modification is prevented at the application layer.
 """
-from sqlalchemy import Column, Integer, String, DateTime, ForeignKey, func
+from sqlalchemy import BINARY, Column, Integer, DateTime, ForeignKey, func
 from sqlalchemy.orm import relationship
 from .base import Base
 
@@ -23,15 +24,14 @@ class PaymentLedger(Base):
         Integer,
         ForeignKey("invoices.id", ondelete="RESTRICT"),  # Prevent delete if ledger exists
         nullable=False,
-        unique=True,  # One ledger entry per invoice payment
-        index=True
+        unique=True  # One ledger entry per invoice payment (unique constraint provides the index)
     )
-    transaction_hash = Column(String(64), nullable=False, unique=True, index=True)  # SHA-256 hex length
-    previous_hash = Column(String(64), nullable=False, index=True)  # "0" for genesis
+    transaction_hash = Column(BINARY(32), nullable=False, unique=True)  # SHA-256 digest; unique constraint provides the index
+    previous_hash = Column(BINARY(32), nullable=False, index=True)  # 32 zero bytes for genesis
     timestamp = Column(DateTime, server_default=func.now(), nullable=False)
 
     # Relationships
     invoice = relationship("Invoice", back_populates="payment_ledger_entry", uselist=False)
 
     def __repr__(self):
-        return f"<PaymentLedger(id={self.id}, invoice_id={self.invoice_id}, hash={self.transaction_hash[:16]}...)>"
+        return f"<PaymentLedger(id={self.id}, invoice_id={self.invoice_id}, hash={self.transaction_hash.hex()[:16]}...)>"
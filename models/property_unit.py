@@ -1,5 +1,5 @@
 # models/property_unit.py
-from sqlalchemy import Column, Integer, String, Numeric, Text, DateTime, ForeignKey, func
+from sqlalchemy import Column, Integer, String, Numeric, Text, DateTime, ForeignKey, Index, func
 from sqlalchemy.orm import relationship
 from .base import Base
 
@@ -10,6 +10,17 @@ class PropertyUnit(Base):
     Maps to existing 'property_units' table in the database.
     """
     __tablename__ = "property_units"
+    __table_args__ = (
+        # Covers the vacant-units listing: seek on status, join on property_id
+        Index(
+            "ix_property_units_status_property",
+            "status",
+            "property_id",
+            mssql_include=["unit_number", "unit_type", "rent_price"],
+        ),
+        # Seek target for the duplicate unit-number check on create/update
+        Index("ix_property_units_property_unit_number", "property_id", "unit_number"),
+    )
 
     id = Column(Integer, primary_key=True, autoincrement=True)
     property_id = Column(Integer, ForeignKey("properties.id", ondelete="CASCADE"), nullable=False)
@@ -21,6 +21,12 @@ logger = logging.getLogger(__name__)
 
 router = APIRouter(prefix="/api/checkout", tags=["checkout"])
 
+# Maya webhook target, resolved once at import
+WEBHOOK_URL = os.getenv(
+    "WEBHOOK_URL",
+    "https://api.condoease.ph/api/webhooks/payments/maya"
+)
+
 
 class CheckoutRequest(BaseModel):
     """Request to initiate checkout."""
@@ -121,12 +127,6 @@ async def initiate_checkout(
                 detail="Invoice is already paid"
             )
         
-        # Build webhook URL
-        webhook_url = os.getenv(
-            "WEBHOOK_URL",
-            "https://api.condoease.ph/api/webhooks/payments/maya"
-        )
-        
         logger.info(f"Creating checkout for invoice {invoice_id}, amount: {invoice.amount}")
         
         # Create checkout
@@ -134,7 +134,7 @@ async def initiate_checkout(
             db=db,
             invoice_id=invoice_id,
             return_url=request_data.return_url,
-            webhook_url=webhook_url
+            webhook_url=WEBHOOK_URL
         )
         
         logger.info(f"Checkout created: {checkout_data['checkout_id']}")
@@ -56,7 +56,7 @@ def confirm_payment(
         if invoice.payment_ledger_entry:
             return PaymentConfirmResponse(
                 invoice_id=invoice.id,
-                transaction_hash=invoice.payment_ledger_entry.transaction_hash,
+                transaction_hash=invoice.payment_ledger_entry.transaction_hash.hex(),
                 provider_reference=body.provider_reference,
                 status="PAID",
             )
@@ -78,7 +78,7 @@ def confirm_payment(
             db.refresh(invoice)
             return PaymentConfirmResponse(
                 invoice_id=invoice.id,
-                transaction_hash=entry.transaction_hash,
+                transaction_hash=entry.transaction_hash.hex(),
                 provider_reference=body.provider_reference,
                 status="PAID",
             )
@@ -104,7 +104,7 @@ def confirm_payment(
             amount=invoice.amount,
             timestamp=None,
         )
-        transaction_hash = entry.transaction_hash
+        transaction_hash = entry.transaction_hash.hex()
     except ValueError:
         db.rollback()
         raise HTTPException(
@@ -21,7 +21,7 @@ from models import PaymentLedger, Invoice
 
 
 # Genesis block: no previous record
-GENESIS_HASH = "0"
+GENESIS_HASH = bytes(32)
 
 
 def _normalize_amount(amount: Decimal) -> str:
@@ -39,12 +39,12 @@ def compute_transaction_hash(
     tenant_id: int,
     amount: Decimal,
     timestamp: datetime
-) -> str:
+) -> bytes:
     """
     Compute SHA-256 hash for a payment record.
 
     Input string: invoice_id|tenant_id|amount|timestamp (canonical format).
-    Returns 64-char hex string.
+    Returns the raw 32-byte digest (stored as BINARY(32)).
     """
     payload = "|".join([
         str(invoice_id),
@@ -52,10 +52,10 @@ def compute_transaction_hash(
         _normalize_amount(amount),
         _normalize_timestamp(timestamp)
     ])
-    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+    return hashlib.sha256(payload.encode("utf-8")).digest()
 
 
-def get_previous_hash(db: Session) -> str:
+def get_previous_hash(db: Session) -> bytes:
     """Get the transaction_hash of the most recent ledger entry, or GENESIS_HASH if empty."""
     last = db.query(PaymentLedger).order_by(desc(PaymentLedger.id)).limit(1).first()
     if last is None:
@@ -74,7 +74,7 @@ def append_payment_record(
     Append an immutable payment record to the ledger (when payment is confirmed).
 
     - Computes transaction_hash from invoice_id + tenant_id + amount + timestamp
-    - Sets previous_hash to the last record's transaction_hash (or "0")
+    - Sets previous_hash to the last record's transaction_hash (or GENESIS_HASH)
     - Does NOT update or delete existing records (immutability)
 
     Raises:
@@ -138,7 +138,7 @@ def verify_ledger_entry(
     )
 
     if computed != entry.transaction_hash:
-        return False, f"Hash mismatch: stored={entry.transaction_hash[:16]}..., computed={computed[:16]}..."
+        return False, f"Hash mismatch: stored={entry.transaction_hash.hex()[:16]}..., computed={computed.hex()[:16]}..."
 
     # Optionally verify chain: previous_hash should match previous record's transaction_hash
     if entry.previous_hash != GENESIS_HASH:
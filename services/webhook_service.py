@@ -126,7 +126,7 @@ class WebhookProcessor:
                 if invoice.payment_ledger_entry:
                     return True, "Invoice already paid", {
                         "invoice_id": invoice_id,
-                        "transaction_hash": invoice.payment_ledger_entry.transaction_hash,
+                        "transaction_hash": invoice.payment_ledger_entry.transaction_hash.hex(),
                         "status": "ALREADY_PAID"
                     }
             
@@ -150,11 +150,11 @@ class WebhookProcessor:
                 )
                 db.commit()
                 
-                logger.info(f"Invoice {invoice_id} marked as PAID with hash {entry.transaction_hash[:16]}...")
+                logger.info(f"Invoice {invoice_id} marked as PAID with hash {entry.transaction_hash.hex()[:16]}...")
                 
                 return True, "Payment confirmed successfully", {
                     "invoice_id": invoice_id,
-                    "transaction_hash": entry.transaction_hash,
+                    "transaction_hash": entry.transaction_hash.hex(),
                     "status": "PAID",
                     "timestamp": entry.timestamp.isoformat()
                 }
@@ -0,0 +1,62 @@
+#!/usr/bin/env python
+"""
+Tests for the SMALLINT storage of invoice status (models.invoice.InvoiceStatusType).
+
+Uses an in-memory SQLite table, so no SQL Server is needed.
+
+Run:
+    python -m pytest test_invoice_status.py
+"""
+import sqlalchemy as sa
+
+from models.invoice import InvoiceStatus, InvoiceStatusCode, InvoiceStatusType
+
+
+def _status_table():
+    metadata = sa.MetaData()
+    table = sa.Table(
+        "invoice_status_probe",
+        metadata,
+        sa.Column("id", sa.Integer, primary_key=True),
+        sa.Column("status", InvoiceStatusType()),
+    )
+    engine = sa.create_engine("sqlite://")
+    metadata.create_all(engine)
+    return engine, table
+
+
+def test_codes_match_migration():
+    """The codes are baked into the migration's CASE and CHECK (0, 1, 2)."""
+    assert {s.name: s.value for s in InvoiceStatusCode} == {"PENDING": 0, "PAID": 1, "OVERDUE": 2}
+    assert [s.name for s in InvoiceStatusCode] == [s.name for s in InvoiceStatus]
+
+
+def test_status_round_trip():
+    """Each status is stored as its code and read back as the string enum."""
+    engine, table = _status_table()
+    with engine.begin() as conn:
+        for i, status in enumerate(InvoiceStatus):
+            conn.execute(table.insert().values(id=i, status=status))
+        # Plain strings (as sent by the API) bind the same way
+        conn.execute(table.insert().values(id=10, status="PAID"))
+
+        raw = conn.execute(sa.text("SELECT id, status FROM invoice_status_probe ORDER BY id")).all()
+        assert raw == [(0, 0), (1, 1), (2, 2), (10, 1)]
+
+        loaded = conn.execute(sa.select(table.c.status).order_by(table.c.id)).scalars().all()
+        assert loaded == [InvoiceStatus.PENDING, InvoiceStatus.PAID, InvoiceStatus.OVERDUE, InvoiceStatus.PAID]
+
+
+def test_status_filter_binds_code():
+    """WHERE status = <enum> compares against the code, not the name."""
+    engine, table = _status_table()
+    with engine.begin() as conn:
+        conn.execute(table.insert(), [{"id": 1, "status": InvoiceStatus.PENDING}, {"id": 2, "status": InvoiceStatus.OVERDUE}])
+        ids = conn.execute(sa.select(table.c.id).where(table.c.status == InvoiceStatus.OVERDUE)).scalars().all()
+        assert ids == [2]
+
+
+def test_null_status_passes_through():
+    status_type = InvoiceStatusType()
+    assert status_type.process_bind_param(None, None) is None
+    assert status_type.process_result_value(None, None) is None
@@ -0,0 +1,183 @@
+#!/usr/bin/env python
+"""
+Tests for the payment ledger hash chain (services.ledger_service).
+
+Runs against an in-memory SQLite database built from the models, so no
+SQL Server is needed.
+
+Run:
+    python -m pytest test_ledger_service.py
+"""
+import hashlib
+import importlib.util
+from datetime import date, datetime
+from decimal import Decimal
+from pathlib import Path
+
+import pytest
+import sqlalchemy as sa
+from sqlalchemy.orm import sessionmaker
+
+import database
+from models import Base, Invoice, PaymentLedger
+from services.ledger_service import (
+    GENESIS_HASH,
+    append_payment_record,
+    compute_transaction_hash,
+    verify_full_chain,
+    verify_ledger_entry,
+)
+
+
+@pytest.fixture
+def db():
+    engine = sa.create_engine("sqlite://")
+    Base.metadata.create_all(engine)
+    session = sessionmaker(bind=engine)()
+    for invoice_id in (1, 2):
+        session.add(Invoice(
+            id=invoice_id, tenant_id=10, lease_id=20,
+            amount=Decimal("5000.00"), due_date=date(2026, 11, 1),
+        ))
+    session.flush()
+    yield session
+    session.close()
+
+
+def test_hash_is_raw_sha256_digest():
+    """Stored digest is 32 bytes; its hex form matches the old hexdigest values."""
+    ts = datetime(2026, 10, 16, 9, 30)
+    digest = compute_transaction_hash(1, 10, Decimal("5000"), ts)
+    expected = hashlib.sha256(f"1|10|5000.00|{ts.isoformat()}".encode("utf-8"))
+    assert isinstance(digest, bytes) and len(digest) == 32
+    assert digest == expected.digest()
+    assert digest.hex() == expected.hexdigest()
+
+
+def test_genesis_is_32_zero_bytes():
+    """Matches the value migration 20261016_000007 writes for the old "0" marker."""
+    assert GENESIS_HASH == b"\x00" * 32
+
+
+def test_chain_links_from_genesis(db):
+    first = append_payment_record(db, 1, 10, Decimal("5000.00"), datetime(2026, 10, 16, 9, 0))
+    second = append_payment_record(db, 2, 10, Decimal("5000.00"), datetime(2026, 10, 16, 9, 5))
+
+    assert first.previous_hash == GENESIS_HASH
+    assert second.previous_hash == first.transaction_hash
+    assert verify_ledger_entry(db, invoice_id=2) == (True, "Verification passed")
+    assert verify_full_chain(db) == (True, "Full chain verification passed", 2)
+
+
+def test_tampered_hash_is_detected(db):
+    append_payment_record(db, 1, 10, Decimal("5000.00"), datetime(2026, 10, 16, 9, 0))
+    entry = db.query(PaymentLedger).one()
+    entry.transaction_hash = bytes(31) + b"\x01"
+    db.flush()
+
+    ok, message = verify_ledger_entry(db, ledger_id=entry.id)
+    assert not ok and message.startswith("Hash mismatch")
+
+
+def test_duplicate_invoice_is_rejected(db):
+    append_payment_record(db, 1, 10, Decimal("5000.00"))
+    with pytest.raises(ValueError):
+        append_payment_record(db, 1, 10, Decimal("5000.00"))
+
+
+class ColumnOrderOp:
+    """
+    Stand-in for ``alembic.op`` that only tracks each table's physical
+    column order, with SQL Server semantics: ADD appends, DROP removes,
+    sp_rename keeps the position.
+    """
+
+    def __init__(self):
+        self.tables = {}
+
+    def create_table(self, name, *items, **kw):
+        self.tables[name] = [c.name for c in items if hasattr(c, "type")]
+
+    def drop_table(self, name, **kw):
+        self.tables.pop(name, None)
+
+    def add_column(self, table, column, **kw):
+        self.tables[table].append(column.name)
+
+    def drop_column(self, table, name, **kw):
+        self.tables[table].remove(name)
+
+    def alter_column(self, table, name, new_column_name=None, **kw):
+        if new_column_name and table in self.tables:
+            columns = self.tables[table]
+            columns[columns.index(name)] = new_column_name
+
+    def __getattr__(self, name):
+        return lambda *args, **kw: None
+
+
+def _migrated_columns(table):
+    """Replay every revision's upgrade() in order and return table's columns."""
+    fake_op = ColumnOrderOp()
+    versions = Path(__file__).parent / "alembic" / "versions"
+    for path in sorted(versions.glob("*.py")):
+        spec = importlib.util.spec_from_file_location(path.stem, path)
+        module = importlib.util.module_from_spec(spec)
+        spec.loader.exec_module(module)
+        module.op = fake_op
+        module.paginated_migrate = lambda *args, **kw: 0
+        module.upgrade()
+    return fake_op.tables[table]
+
+
+class BulkCopyConnection:
+    """Raw pool connection exposing sys.columns for one table and recording bulk_copy."""
+
+    def __init__(self, columns):
+        self.columns = columns
+        self.driver_connection = self
+        self.bulk_copies = []
+
+    def cursor(self):
+        return self
+
+    def execute(self, sql, params=None):
+        assert "sys.columns" in sql
+
+    def fetchall(self):
+        return [(name,) for name in self.columns]
+
+    def bulk_copy(self, table, rows, column_ids=None, batch_size=None):
+        self.bulk_copies.append((table, list(rows), column_ids))
+
+    def commit(self):
+        pass
+
+    def rollback(self):
+        pass
+
+    def close(self):
+        pass
+
+
+def test_bulk_append_maps_tuples_onto_migrated_columns(monkeypatch):
+    """20261016_000007 moves the hash columns to the end; tuples must still land by name."""
+    columns = _migrated_columns("payment_ledger")
+    assert columns == ["id", "invoice_id", "timestamp", "transaction_hash", "previous_hash"]
+
+    conn = BulkCopyConnection(columns)
+    monkeypatch.setattr(database.engine, "raw_connection", lambda: conn)
+    ts = datetime(2026, 10, 16, 9, 0)
+    digest = compute_transaction_hash(1, 10, Decimal("5000.00"), ts)
+
+    assert database.ledger_bulk_append([(1, digest, GENESIS_HASH, ts)]) == 1
+
+    table, rows, column_ids = conn.bulk_copies[0]
+    assert table == "payment_ledger"
+    placed = {columns[column_id - 1]: value for column_id, value in zip(column_ids, rows[0])}
+    assert placed == {
+        "invoice_id": 1,
+        "transaction_hash": digest,
+        "previous_hash": GENESIS_HASH,
+        "timestamp": ts,
+    }
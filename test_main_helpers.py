@@ -0,0 +1,355 @@
+#!/usr/bin/env python
+"""
+Tests for the raw-SQL helpers in main.py.
+
+No database needed: the pooled pymssql connection is replaced by a fake
+that records statements and keeps the one piece of session state these
+helpers care about (SET NOCOUNT).
+
+Run:
+    python -m pytest test_main_helpers.py
+"""
+import io
+import os
+import re
+import tempfile
+from datetime import datetime
+
+import pytest
+from fastapi import HTTPException
+
+import main
+
+
+class FakeCursor:
+    """Records executed SQL; rowcount follows the connection's NOCOUNT state."""
+
+    def __init__(self, conn):
+        self.conn = conn
+        self.description = None
+
+    def execute(self, sql, params=None):
+        self.conn.statements.append((sql, params))
+        # SETs inside sp_executesql are scoped to that call; in a plain batch
+        # they stick to the session. An aborted batch only gets as far as its
+        # first SET.
+        if not sql.startswith("EXEC sp_executesql"):
+            states = re.findall(r"SET NOCOUNT (ON|OFF)", sql, re.IGNORECASE)
+            if self.conn.abort_batches:
+                states = states[:1]
+            for state in states:
+                self.conn.nocount = state.upper() == "ON"
+        if self.conn.abort_batches and "INSERT" in sql:
+            raise RuntimeError("Transaction (Process ID 52) was deadlocked")
+
+    @property
+    def rowcount(self):
+        return -1 if self.conn.nocount else self.conn.affected
+
+    def fetchone(self):
+        return self.conn.results.pop(0) if self.conn.results else None
+
+    def fetchall(self):
+        rows, self.conn.results = self.conn.results, []
+        return rows
+
+
+class FakeConnection:
+    """Stand-in for a pooled connection that outlives a single request."""
+
+    def __init__(self, results=None, affected=1, abort_batches=False):
+        self.statements = []
+        self.abort_batches = abort_batches
+        self.results = list(results or [])
+        self.affected = affected
+        self.nocount = False
+        self.closed = 0
+
+    def cursor(self, as_dict=False):
+        return FakeCursor(self)
+
+    def commit(self):
+        pass
+
+    def rollback(self):
+        pass
+
+    def close(self):
+        self.closed += 1
+
+
+def test_execute_prepared_wraps_params_in_sp_executesql():
+    conn = FakeConnection()
+    main.execute_prepared(
+        conn.cursor(), "SELECT id FROM users WHERE email = @p1 AND role = @p2",
+        "@p1 nvarchar(255), @p2 nvarchar(20)", ("a@example.com", "tenant"),
+    )
+    sql, params = conn.statements[-1]
+    # One %s each for the statement, its declaration, and every value
+    assert sql == "EXEC sp_executesql %s, %s, %s, %s"
+    assert params == (
+        "SELECT id FROM users WHERE email = @p1 AND role = @p2",
+        "@p1 nvarchar(255), @p2 nvarchar(20)",
+        "a@example.com", "tenant",
+    )
+
+
+def test_execute_prepared_without_params_runs_sql_directly():
+    conn = FakeConnection()
+    main.execute_prepared(conn.cursor(), "SELECT COUNT(*) FROM tenants", "", ())
+    assert conn.statements[-1] == ("SELECT COUNT(*) FROM tenants", None)
+
+
+def test_fold_attachments_collects_joined_rows():
+    request = {"id": 4, "title": "Leak", "status": "open"}
+    rows = [
+        {**request, "attachment_id": 1, "file_url": "a.jpg", "file_type": "image", "uploaded_at": "t1"},
+        {**request, "attachment_id": 2, "file_url": "b.pdf", "file_type": "doc", "uploaded_at": "t2"},
+    ]
+    assert main.fold_attachments(rows) == {
+        **request,
+        "attachments": [
+            {"attachment_id": 1, "file_url": "a.jpg", "file_type": "image", "uploaded_at": "t1"},
+            {"attachment_id": 2, "file_url": "b.pdf", "file_type": "doc", "uploaded_at": "t2"},
+        ],
+    }
+
+
+def test_fold_attachments_without_attachments():
+    """LEFT JOIN with no match: one row of NULL attachment columns, empty list."""
+    row = {"id": 4, "title": "Leak", "attachment_id": None, "file_url": None, "file_type": None, "uploaded_at": None}
+    assert main.fold_attachments([row]) == {"id": 4, "title": "Leak", "attachments": []}
+
+
+class FakeUpload:
+    filename = "id.png"
+    file = io.BytesIO(b"scan")
+
+
+def _create_tenant(monkeypatch, conn):
+    monkeypatch.setattr(main, "copy_upload", lambda src, path: None)
+    monkeypatch.setattr(main, "hash_password", lambda pw: "hashed")
+    return main.create_tenant(
+        lastName="Cruz", firstName="Ana", email="ana@example.com",
+        contactNumber="0917", street="1 Main", barangay="Poblacion",
+        city="Makati", province="Metro Manila", idType="passport",
+        idNumber="P123", idDocument=FakeUpload(), occupationStatus="employed",
+        occupationPlace="Acme", emergencyContactName="Ben",
+        emergencyContactNumber="0918", token={}, db=conn,
+    )
+
+
+def test_create_tenant_leaves_rowcount_usable(monkeypatch):
+    """A reused connection must still report rowcount after create_tenant."""
+    conn = FakeConnection(results=[None, {"id": 7}])
+
+    assert _create_tenant(monkeypatch, conn)["user_id"] == 7
+    assert not conn.nocount
+    assert conn.cursor().rowcount == 1
+
+
+def test_create_tenant_aborted_batch_leaves_rowcount_usable(monkeypatch):
+    """Same after the insert batch dies partway (deadlock victim, conversion error)."""
+    conn = FakeConnection(results=[None], abort_batches=True)
+
+    with pytest.raises(HTTPException) as exc:
+        _create_tenant(monkeypatch, conn)
+    assert exc.value.status_code == 500
+    assert not conn.nocount
+    assert conn.cursor().rowcount == 1
+
+
+def test_create_tenant_binds_each_value_once(monkeypatch):
+    """The @pN slots in the batch line up with the sp_executesql values."""
+    conn = FakeConnection(results=[None, {"id": 7}])
+    _create_tenant(monkeypatch, conn)
+    sql, params = conn.statements[-1]
+    batch, decl, values = params[0], params[1], params[2:]
+    used = {int(n) for n in re.findall(r"@p(\d+)", batch)}
+    assert used == set(range(1, len(values) + 1))
+    assert decl.count("@p") == len(values) == 16
+    assert values[:4] == ("Ana", "Cruz", "ana@example.com", "hashed")
+
+
+def _fake_pool(monkeypatch, conn):
+    """Route cached_list's checkouts to conn, counting them."""
+    checkouts = []
+
+    def raw_connection():
+        checkouts.append(conn)
+        return conn
+
+    monkeypatch.setattr(main.engine, "raw_connection", raw_connection)
+    main.invalidate_list_cache()
+    return checkouts
+
+
+def test_cached_list_serves_hits_without_checkout(monkeypatch):
+    conn = FakeConnection(results=[{"id": 1}])
+    checkouts = _fake_pool(monkeypatch, conn)
+
+    first = main.cached_list(("units", 1), "SELECT id FROM property_units WHERE id = @p1", "@p1 int", (1,))
+    second = main.cached_list(("units", 1), "SELECT id FROM property_units WHERE id = @p1", "@p1 int", (1,))
+
+    assert first == second == [{"id": 1}]
+    assert len(checkouts) == 1
+    assert conn.closed == 1
+
+
+def test_cached_list_pool_timeout_is_503(monkeypatch):
+    def raw_connection():
+        raise main.PoolTimeoutError("QueuePool limit reached")
+
+    monkeypatch.setattr(main.engine, "raw_connection", raw_connection)
+    main.invalidate_list_cache()
+
+    with pytest.raises(HTTPException) as exc:
+        main.cached_list(("tenants", 0, 50), "SELECT * FROM tenants", "", ())
+    assert exc.value.status_code == 503
+
+
+def _route(method, path):
+    for route in main.app.routes:
+        if getattr(route, "path", None) == path and method in route.methods:
+            return route
+    raise AssertionError(f"{method} {path} not registered")
+
+
+def _run_write(method, path, handler):
+    """Run a write handler the way FastAPI does: wrapped in its dependencies."""
+    assert any(d.dependency is main.invalidates_lists for d in _route(method, path).dependencies)
+    dependency = main.invalidates_lists()
+    next(dependency)
+    try:
+        return handler(FakeConnection(results=[{"user_id": 9, "id": 3}]))
+    finally:
+        next(dependency, None)
+
+
+DETAIL_ROW = {
+    "id_document_url": None, "id_type": None, "created_at": None,
+    "id": 3, "property_id": 1, "unit_number": "1A",
+}
+
+CACHED_READS = {
+    "tenant": lambda: main.get_tenant_by_id(5, token={}),
+    "owner": lambda: main.get_owner_by_id(5, token={}),
+    "vacant": lambda: main.get_vacant_property_units(token={}),
+}
+
+
+@pytest.mark.parametrize("read, method, path, handler", [
+    ("tenant", "PUT", "/api/tenants/{tenant_id}/status",
+     lambda db: main.update_tenant_status(5, main.TenantStatusUpdate(status="approved"), token={}, db=db)),
+    ("owner", "PUT", "/api/owners/{owner_id}/status",
+     lambda db: main.update_owner_status(5, main.OwnerStatusUpdate(status="approved"), token={}, db=db)),
+    ("vacant", "DELETE", "/api/property-units/{unit_id}",
+     lambda db: main.delete_property_unit(3, token={}, db=db)),
+], ids=list(CACHED_READS))
+def test_writes_invalidate_cached_reads(monkeypatch, read, method, path, handler):
+    """A write route clears the cached detail/vacant rows so the next read hits the DB."""
+    checkouts = []
+
+    def raw_connection():
+        conn = FakeConnection(results=[dict(DETAIL_ROW)])
+        checkouts.append(conn)
+        return conn
+
+    monkeypatch.setattr(main.engine, "raw_connection", raw_connection)
+    main.invalidate_list_cache()
+
+    CACHED_READS[read]()
+    CACHED_READS[read]()
+    assert len(checkouts) == 1
+
+    _run_write(method, path, handler)
+
+    CACHED_READS[read]()
+    assert len(checkouts) == 2
+
+
+@pytest.mark.parametrize("read", [
+    lambda: main.get_all_tenants(page=1, page_size=50, token={}),
+    *CACHED_READS.values(),
+], ids=["tenants", *CACHED_READS])
+def test_cached_reads_report_pool_timeout_as_503(monkeypatch, read):
+    def raw_connection():
+        raise main.PoolTimeoutError("QueuePool limit reached")
+
+    monkeypatch.setattr(main.engine, "raw_connection", raw_connection)
+    main.invalidate_list_cache()
+
+    with pytest.raises(HTTPException) as exc:
+        read()
+    assert exc.value.status_code == 503
+
+
+def test_copy_upload_keeps_small_spools_in_memory(tmp_path):
+    spool = tempfile.SpooledTemporaryFile(max_size=1024)
+    spool.write(b"small upload")
+    spool.seek(0)
+
+    main.copy_upload(spool, tmp_path / "small.bin")
+
+    assert (tmp_path / "small.bin").read_bytes() == b"small upload"
+    assert isinstance(spool._file, io.BytesIO)  # not rolled over to disk
+
+
+def test_copy_upload_rolled_spool_and_plain_streams(tmp_path):
+    payload = os.urandom(3 * main.UPLOAD_CHUNK_SIZE + 17)
+    spool = tempfile.SpooledTemporaryFile(max_size=1024)
+    spool.write(payload)
+    spool.seek(0)
+    main.copy_upload(spool, tmp_path / "big.bin")
+    assert (tmp_path / "big.bin").read_bytes() == payload
+
+    # No fileno() at all: falls back to the copy loop
+    main.copy_upload(io.BytesIO(payload), tmp_path / "stream.bin")
+    assert (tmp_path / "stream.bin").read_bytes() == payload
+
+
+@pytest.mark.parametrize("before, before_id", [(datetime(2026, 10, 1), None), (None, 12)])
+def test_keyset_cursor_halves_must_come_together(before, before_id):
+    """Half a cursor would seek to id < 0 and drop rows sharing the boundary timestamp."""
+    with pytest.raises(HTTPException) as exc:
+        main.get_all_leases(before=before, before_id=before_id, limit=2, layout="rows", token={})
+    assert exc.value.status_code == 422
+    with pytest.raises(HTTPException) as exc:
+        main.get_maintenance_requests(
+            before=before, before_id=before_id, limit=2, layout="rows", token={}, db=FakeConnection(),
+        )
+    assert exc.value.status_code == 422
+
+
+def test_lease_page_returns_next_cursor(monkeypatch):
+    rows = [
+        {"id": 9, "created_at": datetime(2026, 10, 2, 8, 0)},
+        {"id": 7, "created_at": datetime(2026, 10, 1, 8, 0)},
+    ]
+    _fake_pool(monkeypatch, FakeConnection(results=rows))
+
+    full = main.get_all_leases(before=None, before_id=None, limit=2, layout="rows", token={})
+    assert full.headers["X-Next-Before"] == "2026-10-01T08:00:00"
+    assert full.headers["X-Next-Before-Id"] == "7"
+
+    _fake_pool(monkeypatch, FakeConnection(results=rows[:1]))
+    last = main.get_all_leases(before=None, before_id=None, limit=2, layout="rows", token={})
+    assert "X-Next-Before" not in last.headers
+
+
+def test_maintenance_page_returns_next_cursor():
+    rows = [
+        {"maintenance_request_id": 5, "created_at": datetime(2026, 10, 2)},
+        {"maintenance_request_id": 4, "created_at": datetime(2026, 10, 2)},
+    ]
+    conn = FakeConnection(results=list(rows))
+    page = main.get_maintenance_requests(
+        before=datetime(2026, 10, 3), before_id=11, limit=2, layout="rows", token={}, db=conn,
+    )
+    assert page == {"requests": rows, "next_before": datetime(2026, 10, 2), "next_before_id": 4}
+    assert conn.statements[-1][1][2:] == (2, datetime(2026, 10, 3), 11)
+
+    short = main.get_maintenance_requests(
+        before=None, before_id=None, limit=2, layout="rows", token={}, db=FakeConnection(results=rows[:1]),
+    )
+    assert short["next_before"] is None and short["next_before_id"] is None
@@ -1,37 +1,65 @@
-# utils/email.py
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 import os
+import string
 
 BREVO_KEY = os.getenv("BREVO_API_KEY")
 
+_OTP_HTML = string.Template(
+     "<h2>Your verification code</h2>"
+     "<h1 style=\"color:#F28D35\">$otp</h1>"
+     "<p>This code expires in 10 minutes.</p>"
+)
+_SENDER = {"name": "CondoEase", "email": "no-reply@condoease.me"}
+
+# Shared keep-alive session so OTP sends reuse the TLS connection to Brevo.
+# The send is a non-idempotent POST: only connect failures (request never
+# left) are retried; a read timeout or 5xx may already have queued the mail,
+# and a retry would send the user a second OTP.
+_session = requests.Session()
+_session.mount(
+     "https://",
+     HTTPAdapter(
+          pool_maxsize=32,
+          max_retries=Retry(
+               total=3,
+               connect=3,
+               read=0,
+               status=0,
+               backoff_factor=0.2,
+          ),
+     ),
+)
+
 def send_otp_email(to_email: str, otp: str):
      if not BREVO_KEY:
           raise Exception("BREVO_API_KEY is not set")
 
-     response = requests.post(
+     response = _session.post(
           "https://api.brevo.com/v3/smtp/email",
           headers={
                "api-key": BREVO_KEY,
                "Content-Type": "application/json",
           },
           json={
-               "sender": {
-                    "name": "CondoEase",
-                    "email": "no-reply@condoease.me"
-               },
+               "sender": _SENDER,
                "to": [{"email": to_email}],
                "subject": "Your CondoEase Verification Code",
-               "htmlContent": f"""
-                    <h2>Your verification code</h2>
-                    <h1 style="color:#F28D35">{otp}</h1>
-                    <p>This code expires in 10 minutes.</p>
-               """,
+               "htmlContent": _OTP_HTML.substitute(otp=otp),
           },
-          timeout=10,
+          timeout=(3.05, 10),
      )
 
      if response.status_code not in (200, 201):
           print("BREVO RESPONSE:", response.status_code, response.text)
           raise Exception(f"Brevo error: {response.text}")
 
-     return True
\ No newline at end of file
+     return True
+
+def send_otp_email_background(to_email: str, otp: str):
+     """Fire-and-forget variant for BackgroundTasks: logs instead of raising."""
+     try:
+          send_otp_email(to_email, otp)
+     except Exception as email_error:
+          print("EMAIL ERROR:", str(email_error))
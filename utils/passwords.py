@@ -0,0 +1,126 @@
+import asyncio
+import hashlib
+import multiprocessing
+import os
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from typing import Optional
+
+from cachetools import TTLCache
+from passlib.context import CryptContext
+
+# Password hashing: new hashes are Argon2id; existing bcrypt hashes still
+# verify and are upgraded on the next successful login. Argon2 takes the
+# full password, so there is no bcrypt-style 72-byte truncation (and no
+# SHA-256 pre-hash) for anything hashed from here on.
+#
+# Cost is tunable per deployment (defaults are the OWASP Argon2id minimum,
+# 19 MiB / t=2). Hashes made with other parameters are rehashed with the
+# current ones on the next successful login, so changing them needs no
+# data migration.
+ARGON2_TIME_COST = int(os.getenv("ARGON2_TIME_COST", "2"))
+ARGON2_MEMORY_COST = int(os.getenv("ARGON2_MEMORY_COST", "19456"))
+
+pwd_context = CryptContext(
+     schemes=["argon2", "bcrypt"],
+     default="argon2",
+     deprecated="auto",
+     argon2__type="ID",
+     argon2__time_cost=ARGON2_TIME_COST,
+     argon2__memory_cost=ARGON2_MEMORY_COST,
+     argon2__parallelism=1,
+)
+
+# Hashing runs in worker processes so it neither holds the GIL nor pins one
+# of Starlette's threadpool slots; started/stopped from the app lifespan.
+# Falls back to running inline when the pool isn't started (scripts, tests).
+_executor: Optional[ProcessPoolExecutor] = None
+
+# Every uvicorn worker starts its own pool, so split the cores between them
+# rather than giving each one cpu_count processes. HASH_WORKERS overrides.
+HASH_WORKERS = int(os.getenv(
+     "HASH_WORKERS",
+     max(1, (os.cpu_count() or 1) // int(os.getenv("WEB_CONCURRENCY", "1"))),
+))
+
+def _mp_context():
+     # Not fork: children would inherit the server's threads, sockets and
+     # pooled DB connections. forkserver is cheaper than spawn where available.
+     if "forkserver" in multiprocessing.get_all_start_methods():
+          return multiprocessing.get_context("forkserver")
+     return multiprocessing.get_context("spawn")
+
+def start_hash_executor():
+     global _executor
+     if _executor is None:
+          _executor = ProcessPoolExecutor(max_workers=HASH_WORKERS, mp_context=_mp_context())
+
+def shutdown_hash_executor():
+     global _executor
+     if _executor is not None:
+          _executor.shutdown(wait=False, cancel_futures=True)
+          _executor = None
+
+# Module-level so they pickle by reference into the worker processes
+def _hash(password: str) -> str:
+     return pwd_context.hash(password)
+
+def _verify_and_update(password: str, hashed: str) -> tuple[bool, Optional[str]]:
+     return pwd_context.verify_and_update(password, hashed)
+
+def _run(fn, *args):
+     if _executor is None:
+          return fn(*args)
+     return _executor.submit(fn, *args).result()
+
+async def _run_async(fn, *args):
+     if _executor is None:
+          return await asyncio.to_thread(fn, *args)
+     return await asyncio.get_running_loop().run_in_executor(_executor, fn, *args)
+
+# Recent verify results keyed by sha256(password, stored hash), so repeated
+# logins / retries within a minute skip the key schedule entirely.
+_verify_cache = TTLCache(maxsize=10_000, ttl=60)
+_verify_cache_lock = threading.Lock()
+
+def _cache_key(password: str, hashed: str) -> bytes:
+     return hashlib.sha256(password.encode() + b"\0" + hashed.encode()).digest()
+
+def _cache_get(key: bytes) -> Optional[bool]:
+     with _verify_cache_lock:
+          return _verify_cache.get(key)
+
+def _cache_put(key: bytes, ok: bool):
+     with _verify_cache_lock:
+          _verify_cache[key] = ok
+
+def hash_password(password: str) -> str:
+     return _run(_hash, password)
+
+async def hash_password_async(password: str) -> str:
+     return await _run_async(_hash, password)
+
+def verify_password(password: str, hashed: str) -> tuple[bool, Optional[str]]:
+     """
+     Check a password against its stored hash.
+
+     Returns (ok, new_hash); new_hash is set when the stored hash uses a
+     deprecated scheme or parameters and should be written back.
+     """
+     key = _cache_key(password, hashed)
+     cached = _cache_get(key)
+     if cached is not None:
+          return cached, None
+     ok, new_hash = _run(_verify_and_update, password, hashed)
+     _cache_put(key, ok)
+     return ok, new_hash
+
+async def verify_password_async(password: str, hashed: str) -> tuple[bool, Optional[str]]:
+     """Async variant of verify_password for ``async def`` routes."""
+     key = _cache_key(password, hashed)
+     cached = _cache_get(key)
+     if cached is not None:
+          return cached, None
+     ok, new_hash = await _run_async(_verify_and_update, password, hashed)
+     _cache_put(key, ok)
+     return ok, new_hash
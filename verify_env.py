@@ -181,7 +181,7 @@ def verify_imports() -> bool:
         ('fastapi', 'FastAPI'),
         ('sqlalchemy', 'SQLAlchemy'),
         ('pydantic', 'Pydantic'),
-        ('jose', 'PyJOSE'),
+        ('jwt', 'PyJWT'),
         ('dotenv', 'python-dotenv'),
         ('requests', 'Requests'),
         ('cryptography', 'Cryptography'),